@@ -20,6 +20,15 @@ target_metadata = Base.metadata
 settings = get_settings()
 config.set_main_option("sqlalchemy.url", settings.database_url)
 
+# Fail fast instead of queueing behind live traffic: a migration that can't
+# get its lock within a few seconds aborts rather than stalling every query
+# that lines up behind it.  Session-level, so they also cover statements run
+# inside autocommit_block() (e.g. CREATE INDEX CONCURRENTLY).
+MIGRATION_TIMEOUTS = (
+    "SET lock_timeout = '3s'",
+    "SET statement_timeout = '10min'",
+)
+
 
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
@@ -30,12 +39,16 @@ def run_migrations_offline():
         dialect_opts={"paramstyle": "named"},
     )
     with context.begin_transaction():
+        for statement in MIGRATION_TIMEOUTS:
+            context.execute(statement)
         context.run_migrations()
 
 
 def do_run_migrations(connection):
     context.configure(connection=connection, target_metadata=target_metadata)
     with context.begin_transaction():
+        for statement in MIGRATION_TIMEOUTS:
+            context.execute(statement)
         context.run_migrations()
 
 
@@ -6,9 +6,7 @@ Create Date: 2026-02-17
 """
 from typing import Sequence, Union
 
-import sqlalchemy as sa
 from alembic import op
-from sqlalchemy.dialects import postgresql
 
 revision: str = "001"
 down_revision: Union[str, None] = None
@@ -16,128 +14,151 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# The whole initial schema as one DDL script, executed statement by statement.
+SCHEMA_SQL = """
+    -- Chains
+    CREATE TABLE chains (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        slug VARCHAR(50) NOT NULL,
+        logo_url TEXT,
+        website_url TEXT,
+        PRIMARY KEY (id),
+        UNIQUE (slug)
+    );
+
+    -- Stores
+    CREATE TABLE stores (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        chain_id UUID,
+        name VARCHAR(200),
+        address TEXT,
+        city VARCHAR(100),
+        province VARCHAR(10) DEFAULT 'MB',
+        zip_code VARCHAR(10),
+        lat NUMERIC(10, 7),
+        lon NUMERIC(10, 7),
+        PRIMARY KEY (id),
+        FOREIGN KEY(chain_id) REFERENCES chains (id)
+    );
+
+    -- Flyers
+    CREATE TABLE flyers (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        chain_id UUID,
+        store_id UUID,
+        title VARCHAR(300),
+        valid_from DATE NOT NULL,
+        valid_to DATE NOT NULL,
+        source_url TEXT,
+        pages_count INTEGER,
+        status VARCHAR(20) DEFAULT 'pending',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id),
+        FOREIGN KEY(chain_id) REFERENCES chains (id),
+        FOREIGN KEY(store_id) REFERENCES stores (id)
+    );
+
+    -- Flyer pages
+    CREATE TABLE flyer_pages (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        flyer_id UUID,
+        page_number INTEGER,
+        image_url TEXT,
+        ocr_raw_text TEXT,
+        processed BOOLEAN DEFAULT false,
+        PRIMARY KEY (id),
+        FOREIGN KEY(flyer_id) REFERENCES flyers (id)
+    );
+
+    -- Products
+    CREATE TABLE products (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        name VARCHAR(300) NOT NULL,
+        brand VARCHAR(200),
+        category VARCHAR(100),
+        subcategory VARCHAR(100),
+        unit VARCHAR(50),
+        barcode VARCHAR(50),
+        image_url TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id)
+    );
+
+    -- Offers
+    CREATE TABLE offers (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        product_id UUID,
+        flyer_id UUID,
+        chain_id UUID,
+        store_id UUID,
+        original_price NUMERIC(8, 2),
+        offer_price NUMERIC(8, 2) NOT NULL,
+        discount_pct NUMERIC(5, 2),
+        discount_type VARCHAR(50),
+        quantity VARCHAR(100),
+        price_per_unit NUMERIC(8, 2),
+        valid_from DATE,
+        valid_to DATE,
+        raw_text TEXT,
+        confidence NUMERIC(3, 2),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id),
+        FOREIGN KEY(product_id) REFERENCES products (id),
+        FOREIGN KEY(flyer_id) REFERENCES flyers (id),
+        FOREIGN KEY(chain_id) REFERENCES chains (id),
+        FOREIGN KEY(store_id) REFERENCES stores (id)
+    );
+
+    -- Indices on offers
+    CREATE INDEX idx_offers_product ON offers (product_id);
+    CREATE INDEX idx_offers_chain ON offers (chain_id);
+    CREATE INDEX idx_offers_dates ON offers (valid_from, valid_to);
+    CREATE INDEX idx_offers_price ON offers (offer_price);
+
+    -- User profiles
+    CREATE TABLE user_profiles (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        telegram_chat_id BIGINT,
+        push_token TEXT,
+        preferred_zone VARCHAR(100) DEFAULT 'Monza e Brianza',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id)
+    );
+
+    -- User watchlist
+    CREATE TABLE user_watchlist (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        user_id UUID,
+        product_id UUID,
+        target_price NUMERIC(8, 2),
+        notify_any_offer BOOLEAN DEFAULT true,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        PRIMARY KEY (id),
+        CONSTRAINT uq_user_product UNIQUE (user_id, product_id),
+        FOREIGN KEY(user_id) REFERENCES user_profiles (id),
+        FOREIGN KEY(product_id) REFERENCES products (id)
+    );
+
+    -- User stores
+    CREATE TABLE user_stores (
+        id UUID DEFAULT gen_random_uuid() NOT NULL,
+        user_id UUID,
+        store_id UUID,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_user_store UNIQUE (user_id, store_id),
+        FOREIGN KEY(user_id) REFERENCES user_profiles (id),
+        FOREIGN KEY(store_id) REFERENCES stores (id)
+    );
+"""
+
+
 def upgrade() -> None:
-    # Chains
-    op.create_table(
-        "chains",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("name", sa.String(100), nullable=False),
-        sa.Column("slug", sa.String(50), unique=True, nullable=False),
-        sa.Column("logo_url", sa.Text()),
-        sa.Column("website_url", sa.Text()),
-    )
-
-    # Stores
-    op.create_table(
-        "stores",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("chain_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("chains.id")),
-        sa.Column("name", sa.String(200)),
-        sa.Column("address", sa.Text()),
-        sa.Column("city", sa.String(100)),
-        sa.Column("province", sa.String(10), server_default="MB"),
-        sa.Column("zip_code", sa.String(10)),
-        sa.Column("lat", sa.Numeric(10, 7)),
-        sa.Column("lon", sa.Numeric(10, 7)),
-    )
-
-    # Flyers
-    op.create_table(
-        "flyers",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("chain_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("chains.id")),
-        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.id"), nullable=True),
-        sa.Column("title", sa.String(300)),
-        sa.Column("valid_from", sa.Date(), nullable=False),
-        sa.Column("valid_to", sa.Date(), nullable=False),
-        sa.Column("source_url", sa.Text()),
-        sa.Column("pages_count", sa.Integer()),
-        sa.Column("status", sa.String(20), server_default="pending"),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
-    )
-
-    # Flyer pages
-    op.create_table(
-        "flyer_pages",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("flyer_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("flyers.id")),
-        sa.Column("page_number", sa.Integer()),
-        sa.Column("image_url", sa.Text()),
-        sa.Column("ocr_raw_text", sa.Text()),
-        sa.Column("processed", sa.Boolean(), server_default=sa.text("false")),
-    )
-
-    # Products
-    op.create_table(
-        "products",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("name", sa.String(300), nullable=False),
-        sa.Column("brand", sa.String(200)),
-        sa.Column("category", sa.String(100)),
-        sa.Column("subcategory", sa.String(100)),
-        sa.Column("unit", sa.String(50)),
-        sa.Column("barcode", sa.String(50)),
-        sa.Column("image_url", sa.Text()),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
-    )
-
-    # Offers
-    op.create_table(
-        "offers",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id")),
-        sa.Column("flyer_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("flyers.id")),
-        sa.Column("chain_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("chains.id")),
-        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.id"), nullable=True),
-        sa.Column("original_price", sa.Numeric(8, 2)),
-        sa.Column("offer_price", sa.Numeric(8, 2), nullable=False),
-        sa.Column("discount_pct", sa.Numeric(5, 2)),
-        sa.Column("discount_type", sa.String(50)),
-        sa.Column("quantity", sa.String(100)),
-        sa.Column("price_per_unit", sa.Numeric(8, 2)),
-        sa.Column("valid_from", sa.Date()),
-        sa.Column("valid_to", sa.Date()),
-        sa.Column("raw_text", sa.Text()),
-        sa.Column("confidence", sa.Numeric(3, 2)),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
-    )
-
-    # Indices on offers
-    op.create_index("idx_offers_product", "offers", ["product_id"])
-    op.create_index("idx_offers_chain", "offers", ["chain_id"])
-    op.create_index("idx_offers_dates", "offers", ["valid_from", "valid_to"])
-    op.create_index("idx_offers_price", "offers", ["offer_price"])
-
-    # User profiles
-    op.create_table(
-        "user_profiles",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("telegram_chat_id", sa.BigInteger()),
-        sa.Column("push_token", sa.Text()),
-        sa.Column("preferred_zone", sa.String(100), server_default="Monza e Brianza"),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
-    )
-
-    # User watchlist
-    op.create_table(
-        "user_watchlist",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("user_profiles.id")),
-        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id")),
-        sa.Column("target_price", sa.Numeric(8, 2)),
-        sa.Column("notify_any_offer", sa.Boolean(), server_default=sa.text("true")),
-        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
-        sa.UniqueConstraint("user_id", "product_id", name="uq_user_product"),
-    )
-
-    # User stores
-    op.create_table(
-        "user_stores",
-        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
-        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("user_profiles.id")),
-        sa.Column("store_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("stores.id")),
-        sa.UniqueConstraint("user_id", "store_id", name="uq_user_store"),
-    )
+    # The script holds no function bodies or string literals, so ";" only
+    # ever ends a statement.
+    for statement in SCHEMA_SQL.split(";"):
+        if statement.strip():
+            op.execute(statement)
 
 
 def downgrade() -> None:
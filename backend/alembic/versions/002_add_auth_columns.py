@@ -18,10 +18,16 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     op.add_column("user_profiles", sa.Column("email", sa.String(255)))
     op.add_column("user_profiles", sa.Column("password_hash", sa.String(128)))
-    op.create_index("ix_user_profiles_email", "user_profiles", ["email"], unique=True)
+    # Built CONCURRENTLY so user_profiles stays writable during the build.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_user_profiles_email "
+            "ON user_profiles (email)"
+        )
 
 
 def downgrade() -> None:
-    op.drop_index("ix_user_profiles_email", table_name="user_profiles")
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_profiles_email")
     op.drop_column("user_profiles", "password_hash")
     op.drop_column("user_profiles", "email")
@@ -20,20 +20,20 @@ def upgrade() -> None:
         "offers",
         sa.Column("unit_reference", sa.String(20), nullable=True),
     )
-    op.create_index(
-        "idx_offers_product_valid_from",
-        "offers",
-        ["product_id", "valid_from"],
-    )
-    op.create_index(
-        "idx_offers_price_per_unit_notnull",
-        "offers",
-        ["price_per_unit"],
-        postgresql_where=sa.text("price_per_unit IS NOT NULL"),
-    )
+    # Built CONCURRENTLY so the scrapers can keep writing offers meanwhile.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_offers_product_valid_from "
+            "ON offers (product_id, valid_from)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_offers_price_per_unit_notnull "
+            "ON offers (price_per_unit) WHERE price_per_unit IS NOT NULL"
+        )
 
 
 def downgrade() -> None:
-    op.drop_index("idx_offers_price_per_unit_notnull", table_name="offers")
-    op.drop_index("idx_offers_product_valid_from", table_name="offers")
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_offers_price_per_unit_notnull")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_offers_product_valid_from")
     op.drop_column("offers", "unit_reference")
@@ -0,0 +1,32 @@
+"""Add (product_id, valid_to DESC) index for previous-price lookups.
+
+The offer listings fetch each product's most recent expired offer with a
+LATERAL ``ORDER BY valid_to DESC LIMIT 1`` probe; this index lets
+PostgreSQL answer it with a single index descent per product.
+
+Revision ID: 027
+Revises: 026
+Create Date: 2026-10-15
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "027"
+down_revision = "026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Not partial: a "valid_to < CURRENT_DATE" predicate is rejected by
+    # PostgreSQL (index predicates must be immutable).
+    op.create_index(
+        "idx_offers_prev_lookup",
+        "offers",
+        ["product_id", sa.text("valid_to DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_offers_prev_lookup", table_name="offers")
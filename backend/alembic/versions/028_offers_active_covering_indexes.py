@@ -0,0 +1,43 @@
+"""Add covering indexes for the active-offer listings.
+
+``/offers/active`` and ``/offers/best`` filter on the validity window and
+sort by ``offer_price`` or ``discount_pct DESC NULLS LAST``.  These
+indexes match the ORDER BY and carry the filtered columns in INCLUDE, so
+PostgreSQL can walk them in order and check validity without heap visits.
+
+Built CONCURRENTLY (outside the migration transaction) to avoid locking
+``offers`` against writes while the scrapers run.
+
+Revision ID: 028
+Revises: 027
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+
+revision = "028"
+down_revision = "027"
+branch_labels = None
+depends_on = None
+
+# Not partial: "WHERE valid_to >= CURRENT_DATE" is not an immutable
+# predicate, so PostgreSQL refuses it in an index definition.
+_INCLUDE = "product_id, chain_id, valid_from, valid_to"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_offers_active_price "
+            f"ON offers (offer_price) INCLUDE ({_INCLUDE}, discount_pct)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_offers_active_discount "
+            f"ON offers (discount_pct DESC NULLS LAST) INCLUDE ({_INCLUDE}, offer_price)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_offers_active_discount")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_offers_active_price")
@@ -0,0 +1,59 @@
+"""Make user email uniqueness and lookups case-insensitive.
+
+Emails are stored lowercased and looked up via ``lower(email)``; the
+plain unique index on ``email`` is replaced by a unique functional index
+so mixed-case input still hits an index instead of a sequential scan.
+
+Accounts whose emails differ only by case would collide once lowercased;
+the migration refuses to run while any exist and lists them so they can
+be merged by hand.  The new index is built CONCURRENTLY (outside the
+migration transaction) so signups and logins are not blocked meanwhile.
+
+Revision ID: 029
+Revises: 028
+Create Date: 2026-10-15
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "029"
+down_revision = "028"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(
+        sa.text(
+            "SELECT lower(email) AS email, string_agg(id::text, ', ' ORDER BY id) AS ids "
+            "FROM user_profiles WHERE email IS NOT NULL "
+            "GROUP BY lower(email) HAVING count(*) > 1 ORDER BY 1"
+        )
+    ).all()
+    if duplicates:
+        listing = "\n".join(f"  {row.email}: {row.ids}" for row in duplicates)
+        raise RuntimeError(
+            "user_profiles has emails that differ only by case; merge these "
+            f"accounts before upgrading:\n{listing}"
+        )
+
+    op.execute(
+        "UPDATE user_profiles SET email = lower(email) "
+        "WHERE email IS NOT NULL AND email <> lower(email)"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_user_profiles_email_lower "
+            "ON user_profiles (lower(email))"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_profiles_email")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_user_profiles_email "
+            "ON user_profiles (email)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_profiles_email_lower")
@@ -0,0 +1,88 @@
+"""Denormalize product and chain names onto offers.
+
+Offer listings read product name/brand/category/image and chain name from
+the offers row itself instead of joining products and chains. Triggers
+keep the copies in sync; existing rows are backfilled in id-ordered
+batches outside the DDL transaction so no single statement locks the
+whole table.
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-10-15
+"""
+
+import uuid
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.models.offer import OFFER_DENORM_DDL
+
+revision = "030"
+down_revision = "029"
+branch_labels = None
+depends_on = None
+
+_BACKFILL_BATCH = 5000
+
+_COLUMNS = (
+    ("product_name", sa.String(300)),
+    ("product_brand", sa.String(200)),
+    ("product_category", sa.String(100)),
+    ("product_image_url", sa.Text()),
+    ("chain_name", sa.String(100)),
+)
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    after = uuid.UUID(int=0)
+    while True:
+        # Last id of the next batch; None once fewer than a full batch remain.
+        upper = bind.execute(
+            sa.text(
+                "SELECT id FROM offers WHERE id > :after "
+                "ORDER BY id OFFSET :skip LIMIT 1"
+            ),
+            {"after": after, "skip": _BACKFILL_BATCH - 1},
+        ).scalar()
+        bounds = "o.id > :after" + (" AND o.id <= :upper" if upper else "")
+        bind.execute(
+            sa.text(
+                f"""
+                UPDATE offers o SET
+                    (product_name, product_brand, product_category, product_image_url) = (
+                        SELECT p.name, p.brand, p.category, p.image_url
+                        FROM products p WHERE p.id = o.product_id
+                    ),
+                    chain_name = (SELECT c.name FROM chains c WHERE c.id = o.chain_id)
+                WHERE {bounds}
+                """
+            ),
+            {"after": after, "upper": upper} if upper else {"after": after},
+        )
+        if upper is None:
+            break
+        after = upper
+
+
+def upgrade() -> None:
+    for name, type_ in _COLUMNS:
+        op.add_column("offers", sa.Column(name, type_, nullable=True))
+    for stmt in OFFER_DENORM_DDL:
+        op.execute(stmt)
+
+    # Each batch commits on its own.
+    with op.get_context().autocommit_block():
+        _backfill()
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_chains_sync_offers ON chains")
+    op.execute("DROP TRIGGER IF EXISTS trg_products_sync_offers ON products")
+    op.execute("DROP TRIGGER IF EXISTS trg_offers_fill_denorm ON offers")
+    op.execute("DROP FUNCTION IF EXISTS chains_sync_offers()")
+    op.execute("DROP FUNCTION IF EXISTS products_sync_offers()")
+    op.execute("DROP FUNCTION IF EXISTS offers_fill_denorm()")
+    for name, _ in reversed(_COLUMNS):
+        op.drop_column("offers", name)
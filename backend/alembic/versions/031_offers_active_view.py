@@ -0,0 +1,47 @@
+"""Materialized view of non-expired offers for listing endpoints.
+
+Listings filter on validity, which matches a small slice of the offer
+history. ``offers_active`` holds just that slice (with the denormalized
+names from 030) and is refreshed concurrently after scrapes and nightly;
+the unique index on ``id`` is what allows REFRESH ... CONCURRENTLY.
+
+The view carries its own price and discount indexes, so the covering
+indexes 028 added on the full ``offers`` table no longer serve any query
+and only slow down ingestion; they are dropped here.
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+
+from app.models.offer import OFFERS_ACTIVE_DDL
+
+revision = "031"
+down_revision = "030"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for stmt in OFFERS_ACTIVE_DDL:
+        op.execute(stmt)
+
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_offers_active_discount")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_offers_active_price")
+
+
+def downgrade() -> None:
+    include = "product_id, chain_id, valid_from, valid_to"
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_offers_active_price "
+            f"ON offers (offer_price) INCLUDE ({include}, discount_pct)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_offers_active_discount "
+            f"ON offers (discount_pct DESC NULLS LAST) INCLUDE ({include}, offer_price)"
+        )
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS offers_active")
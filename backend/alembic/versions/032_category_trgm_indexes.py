@@ -0,0 +1,34 @@
+"""Add trigram GIN indexes for category substring filters.
+
+Offer listings filter with ``product_category ILIKE '%x%'`` (on the
+offers_active view) and product search with ``category ILIKE '%x%'``;
+a b-tree can't serve a leading wildcard, a pg_trgm GIN index can.
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+
+revision = "032"
+down_revision = "031"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_category_trgm "
+        "ON products USING gin (category gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_offers_active_category_trgm "
+        "ON offers_active USING gin (product_category gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_offers_active_category_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_products_category_trgm")
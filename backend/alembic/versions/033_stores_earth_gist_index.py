@@ -0,0 +1,32 @@
+"""Add a GiST earth-distance index on store coordinates.
+
+Proximity lookups ("stores near me") use ``earth_box(...) @>
+ll_to_earth(lat, lon)``, which this index serves as a bounding-box
+prefilter before the exact ``earth_distance`` check.  cube/earthdistance
+ship with the standard contrib package, so no PostGIS install is needed.
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+
+revision = "033"
+down_revision = "032"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_stores_earth ON stores "
+        "USING gist (ll_to_earth(CAST(lat AS FLOAT), CAST(lon AS FLOAT))) "
+        "WHERE lat IS NOT NULL AND lon IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_stores_earth")
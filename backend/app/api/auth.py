@@ -6,10 +6,17 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import create_access_token, create_refresh_token, get_current_user, hash_password, verify_password
+from app.auth import (
+    create_access_token,
+    create_refresh_token,
+    get_current_user,
+    hash_password_async,
+    verify_password_async,
+)
 from app.database import get_db
 from app.models.user import UserProfile
 
@@ -52,52 +59,80 @@ class AuthResponse(BaseModel):
     user: UserResponse
 
 
+def _email_is(email: str):
+    """Case-insensitive email match, served by ix_user_profiles_email_lower."""
+    return func.lower(UserProfile.email) == email.lower()
+
+
+# Columns needed to build a UserResponse, so the hot auth paths can skip
+# loading (and hydrating) the full user_profiles row.
+_USER_RESPONSE_COLUMNS = (
+    UserProfile.id,
+    UserProfile.email,
+    UserProfile.preferred_zone,
+    UserProfile.is_guest,
+    UserProfile.is_admin,
+    UserProfile.created_at,
+)
+
+
+def _user_response(row) -> UserResponse:
+    """Build a UserResponse from a projected row without re-validating DB output."""
+    return UserResponse.model_construct(
+        id=row.id,
+        email=row.email,
+        preferred_zone=row.preferred_zone,
+        is_guest=row.is_guest,
+        is_admin=row.is_admin,
+        created_at=row.created_at,
+    )
+
+
 # --- Endpoints ---
 
 @router.post("/register", response_model=AuthResponse, status_code=201)
 async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)):
-    # Check if email already exists
-    result = await db.execute(
-        select(UserProfile).where(UserProfile.email == data.email)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
-
     if len(data.password) < 6:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Password must be at least 6 characters")
 
-    user = UserProfile(
-        email=data.email,
-        password_hash=hash_password(data.password),
+    # Uniqueness is checked atomically by ix_user_profiles_email_lower: an
+    # existing email makes the insert a no-op that returns no row.
+    password_hash = await hash_password_async(data.password)
+    result = await db.execute(
+        pg_insert(UserProfile)
+        .values(email=data.email.lower(), password_hash=password_hash)
+        .on_conflict_do_nothing(index_elements=[func.lower(UserProfile.email)])
+        .returning(*_USER_RESPONSE_COLUMNS)
     )
-    db.add(user)
-    await db.flush()
-    await db.refresh(user)
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
 
-    token = create_access_token(str(user.id), user.email)
-    refresh = create_refresh_token(str(user.id))
+    token = create_access_token(str(row.id), row.email)
+    refresh = create_refresh_token(str(row.id))
     return AuthResponse(
         access_token=token,
         refresh_token=refresh,
-        user=UserResponse.model_validate(user),
+        user=_user_response(row),
     )
 
 
 @router.post("/login", response_model=AuthResponse)
 async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(
-        select(UserProfile).where(UserProfile.email == data.email)
+        select(*_USER_RESPONSE_COLUMNS, UserProfile.password_hash).where(_email_is(data.email))
     )
-    user = result.scalar_one_or_none()
-    if not user or not user.password_hash or not verify_password(data.password, user.password_hash):
+    row = result.first()
+    valid = await verify_password_async(data.password, row.password_hash if row else None)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
-    token = create_access_token(str(user.id), user.email)
-    refresh = create_refresh_token(str(user.id))
+    token = create_access_token(str(row.id), row.email)
+    refresh = create_refresh_token(str(row.id))
     return AuthResponse(
         access_token=token,
         refresh_token=refresh,
-        user=UserResponse.model_validate(user),
+        user=_user_response(row),
     )
 
 
@@ -138,7 +173,7 @@ async def claim_guest(
 
     # Check email uniqueness
     existing = await db.execute(
-        select(UserProfile).where(UserProfile.email == data.email)
+        select(UserProfile).where(_email_is(data.email))
     )
     if existing.scalar_one_or_none():
         raise HTTPException(
@@ -152,8 +187,8 @@ async def claim_guest(
             detail="Password must be at least 6 characters",
         )
 
-    user.email = data.email
-    user.password_hash = hash_password(data.password)
+    user.email = data.email.lower()
+    user.password_hash = await hash_password_async(data.password)
     user.is_guest = False
     await db.flush()
     await db.refresh(user)
@@ -202,6 +237,8 @@ async def google_auth(
 
     google_id = idinfo["sub"]
     email = idinfo.get("email")
+    if email:
+        email = email.lower()
 
     # Find existing user by google_id
     result = await db.execute(
@@ -212,7 +249,7 @@ async def google_auth(
     if user is None and email:
         # Check if user exists by email (link accounts)
         result = await db.execute(
-            select(UserProfile).where(UserProfile.email == email)
+            select(UserProfile).where(_email_is(email))
         )
         user = result.scalar_one_or_none()
         if user:
@@ -311,7 +348,7 @@ class ResetPasswordRequest(BaseModel):
 async def forgot_password(data: ForgotPasswordRequest, db: AsyncSession = Depends(get_db)):
     """Generate a password reset token. Always returns 200 to prevent email enumeration."""
     result = await db.execute(
-        select(UserProfile).where(UserProfile.email == data.email)
+        select(UserProfile).where(_email_is(data.email))
     )
     user = result.scalar_one_or_none()
     if user:
@@ -351,7 +388,7 @@ async def reset_password(data: ResetPasswordRequest, db: AsyncSession = Depends(
     if not user:
         raise HTTPException(status_code=400, detail="Invalid token")
 
-    user.password_hash = hash_password(data.new_password)
+    user.password_hash = await hash_password_async(data.new_password)
     await db.flush()
     await db.refresh(user)
 
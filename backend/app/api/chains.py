@@ -1,12 +1,15 @@
 """API routes for supermarket chains."""
 
+import time
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.responses import not_modified, set_cache_headers, weak_etag
 from app.database import get_db
 from app.models import Chain
 
@@ -23,14 +26,53 @@ class ChainResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# Chains are a handful of rows that only change via migrations, so the
+# serialized list is kept in-process:
+# (loaded_at, list_json, list_etag, {id: chain_json}).
+_CHAIN_CACHE_TTL = 300  # seconds
+_chain_cache: tuple[float, bytes, str, dict[str, bytes]] | None = None
+
+
+def clear_chain_cache() -> None:
+    """Drop the cached chain list (next request reloads it)."""
+    global _chain_cache
+    _chain_cache = None
+
+
+async def _get_cached_chains(
+    db: AsyncSession,
+) -> tuple[bytes, str, dict[str, bytes]]:
+    global _chain_cache
+    now = time.monotonic()
+    if _chain_cache is None or now - _chain_cache[0] >= _CHAIN_CACHE_TTL:
+        result = await db.execute(select(Chain).order_by(Chain.name))
+        chains = [
+            ChainResponse.model_validate(c).model_dump(mode="json")
+            for c in result.scalars().all()
+        ]
+        by_id = {c["id"]: orjson.dumps(c) for c in chains}
+        content = orjson.dumps(chains)
+        _chain_cache = (now, content, weak_etag(content), by_id)
+    return _chain_cache[1], _chain_cache[2], _chain_cache[3]
+
+
 @router.get("", response_model=list[ChainResponse])
-async def list_chains(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Chain).order_by(Chain.name))
-    return result.scalars().all()
+async def list_chains(request: Request, db: AsyncSession = Depends(get_db)):
+    content, etag, _ = await _get_cached_chains(db)
+    if (cached := not_modified(request, etag, _CHAIN_CACHE_TTL)) is not None:
+        return cached
+    response = Response(content=content, media_type="application/json")
+    return set_cache_headers(response, etag, _CHAIN_CACHE_TTL)
 
 
 @router.get("/{chain_id}", response_model=ChainResponse)
 async def get_chain(chain_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    _, _, by_id = await _get_cached_chains(db)
+    cached = by_id.get(str(chain_id))
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Not in the cached snapshot: may have been added since it was loaded.
     result = await db.execute(select(Chain).where(Chain.id == chain_id))
     chain = result.scalar_one_or_none()
     if not chain:
@@ -2,14 +2,13 @@
 
 import uuid
 from datetime import date, datetime
-from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Float, cast, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from app.api.responses import dumps, not_modified, set_cache_headers, weak_etag
 from app.database import get_db
 from app.models import Chain, Flyer, FlyerPage, Offer, Product
 
@@ -46,82 +45,100 @@ class FlyerProductResponse(BaseModel):
     product_name: str
     brand: str | None
     category: str | None
-    original_price: Decimal | None
-    offer_price: Decimal
-    discount_pct: Decimal | None
+    original_price: float | None
+    offer_price: float
+    discount_pct: float | None
     discount_type: str | None
     quantity: str | None
 
     model_config = {"from_attributes": True}
 
 
+# Flat projection of the columns FlyerResponse needs; the chain is
+# outer-joined because a flyer's chain_name is optional in the response.
+_FLYER_COLUMNS = (
+    Flyer.id,
+    Flyer.chain_id,
+    Flyer.store_id,
+    Flyer.title,
+    Flyer.valid_from,
+    Flyer.valid_to,
+    Flyer.source_url,
+    Flyer.pages_count,
+    Flyer.status,
+    Flyer.created_at,
+    Chain.name.label("chain_name"),
+)
+
+
+def _flyer_rows_query():
+    return (
+        select(*_FLYER_COLUMNS)
+        .select_from(Flyer)
+        .outerjoin(Chain, Flyer.chain_id == Chain.id)
+    )
+
+
 @router.get("", response_model=list[FlyerResponse])
 async def list_flyers(
+    request: Request,
     chain: str | None = Query(None, description="Filter by chain slug"),
     active: bool = Query(True, description="Only show active flyers"),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Flyer).options(joinedload(Flyer.chain))
+    today = date.today()
+    query = _flyer_rows_query()
 
     if chain:
-        query = query.join(Flyer.chain).where(Chain.slug == chain)
+        query = query.where(Chain.slug == chain)
     if active:
-        today = date.today()
         query = query.where(Flyer.valid_from <= today, Flyer.valid_to >= today)
 
     query = query.order_by(Flyer.valid_to.desc())
     result = await db.execute(query)
-    flyers = result.unique().scalars().all()
-
-    return [
-        FlyerResponse(
-            id=f.id,
-            chain_id=f.chain_id,
-            store_id=f.store_id,
-            title=f.title,
-            valid_from=f.valid_from,
-            valid_to=f.valid_to,
-            source_url=f.source_url,
-            pages_count=f.pages_count,
-            status=f.status,
-            created_at=f.created_at,
-            chain_name=f.chain.name if f.chain else None,
-        )
-        for f in flyers
-    ]
+
+    # Flyers have no updated_at, and title, dates, status or a chain rename
+    # all change the body; hashing the body itself is the only safe version.
+    content = dumps([dict(row) for row in result.mappings()])
+    etag = weak_etag(content)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    return set_cache_headers(
+        Response(content=content, media_type="application/json"), etag
+    )
 
 
 @router.get("/{flyer_id}", response_model=FlyerResponse)
 async def get_flyer(flyer_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Flyer).options(joinedload(Flyer.chain)).where(Flyer.id == flyer_id)
-    )
-    flyer = result.unique().scalar_one_or_none()
-    if not flyer:
+    result = await db.execute(_flyer_rows_query().where(Flyer.id == flyer_id))
+    row = result.mappings().one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Flyer not found")
-    return FlyerResponse(
-        id=flyer.id,
-        chain_id=flyer.chain_id,
-        store_id=flyer.store_id,
-        title=flyer.title,
-        valid_from=flyer.valid_from,
-        valid_to=flyer.valid_to,
-        source_url=flyer.source_url,
-        pages_count=flyer.pages_count,
-        status=flyer.status,
-        created_at=flyer.created_at,
-        chain_name=flyer.chain.name if flyer.chain else None,
-    )
+    return FlyerResponse.model_construct(**row)
 
 
 @router.get("/{flyer_id}/pages", response_model=list[FlyerPageResponse])
-async def get_flyer_pages(flyer_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def get_flyer_pages(
+    flyer_id: uuid.UUID, request: Request, db: AsyncSession = Depends(get_db)
+):
     result = await db.execute(
-        select(FlyerPage)
+        select(
+            FlyerPage.id,
+            FlyerPage.page_number,
+            FlyerPage.image_url,
+            FlyerPage.processed,
+        )
         .where(FlyerPage.flyer_id == flyer_id)
         .order_by(FlyerPage.page_number)
     )
-    return result.scalars().all()
+    # A handful of rows per flyer: the body itself is the cheapest version.
+    content = dumps([dict(row) for row in result.mappings()])
+    etag = weak_etag(content)
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    return set_cache_headers(
+        Response(content=content, media_type="application/json"), etag
+    )
 
 
 @router.get("/{flyer_id}/products", response_model=list[FlyerProductResponse])
@@ -129,23 +146,20 @@ async def get_flyer_products(
     flyer_id: uuid.UUID, db: AsyncSession = Depends(get_db)
 ):
     result = await db.execute(
-        select(Offer)
-        .options(joinedload(Offer.product))
+        select(
+            Offer.product_id,
+            Product.name.label("product_name"),
+            Product.brand,
+            Product.category,
+            cast(Offer.original_price, Float).label("original_price"),
+            cast(Offer.offer_price, Float).label("offer_price"),
+            cast(Offer.discount_pct, Float).label("discount_pct"),
+            Offer.discount_type,
+            Offer.quantity,
+        )
+        .select_from(Offer)
+        .join(Product, Offer.product_id == Product.id)
         .where(Offer.flyer_id == flyer_id)
         .order_by(Offer.offer_price)
     )
-    offers = result.unique().scalars().all()
-    return [
-        FlyerProductResponse(
-            product_id=o.product_id,
-            product_name=o.product.name,
-            brand=o.product.brand,
-            category=o.product.category,
-            original_price=o.original_price,
-            offer_price=o.offer_price,
-            discount_pct=o.discount_pct,
-            discount_type=o.discount_type,
-            quantity=o.quantity,
-        )
-        for o in offers
-    ]
+    return [FlyerProductResponse.model_construct(**row) for row in result.mappings()]
@@ -2,17 +2,20 @@
 
 import uuid
 from datetime import date
-from decimal import Decimal
+from functools import lru_cache
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import Date, Float, Integer, bindparam, cast, func, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
+from app.api.responses import ORJSONResponse, dumps
 from app.auth import get_current_user
-from app.database import get_db
-from app.models import Chain, Offer, Product
+from app.database import async_session, get_db
+from app.models import Chain, Offer
+from app.models.offer import offers_active
 from app.models.user import UserProfile, UserWatchlist
 
 router = APIRouter(prefix="/offers", tags=["offers"])
@@ -26,102 +29,222 @@ class OfferResponse(BaseModel):
     category: str | None
     chain_id: uuid.UUID
     chain_name: str
-    original_price: Decimal | None
-    offer_price: Decimal
-    discount_pct: Decimal | None
+    original_price: float | None
+    offer_price: float
+    discount_pct: float | None
     discount_type: str | None
     quantity: str | None
-    price_per_unit: Decimal | None
+    price_per_unit: float | None
     valid_from: date | None
     valid_to: date | None
     image_url: str | None = None
-    previous_price: Decimal | None = None
+    previous_price: float | None = None
     previous_date: date | None = None
     previous_chain: str | None = None
 
     model_config = {"from_attributes": True}
 
 
-async def _get_previous_prices(
-    product_ids: list[uuid.UUID],
-    before_dates: dict[uuid.UUID, date],
-    db: AsyncSession,
-) -> dict[uuid.UUID, tuple[Decimal, date, str]]:
-    """Batch-fetch the most recent expired offer for each product.
+# Non-expired offers (the offers_active materialized view), mapped like
+# Offer so the same column expressions work against either source. Offers
+# appear here after the next view refresh: at the end of each scrape or
+# catalog sync, otherwise within the hour (see app.models.offer).
+ActiveOffer = aliased(Offer, offers_active, adapt_on_names=True)
 
-    Returns {product_id: (offer_price, valid_from, chain_name)}.
-    Uses a window function to pick only the latest expired offer per product.
+
+def _offer_columns(src) -> tuple:
+    """Flat projection of exactly the columns OfferResponse needs.
+
+    Product and chain fields come from their denormalized copies on offers,
+    so listings read a single table; missing names fall back to "Unknown"
+    as elsewhere in the API. Prices are display values, so
+    PostgreSQL casts them to float8 and the driver skips building a
+    Decimal per field.
     """
-    if not product_ids:
-        return {}
+    return (
+        src.id,
+        src.product_id,
+        func.coalesce(src.product_name, "Unknown").label("product_name"),
+        src.product_brand.label("brand"),
+        src.product_category.label("category"),
+        src.chain_id,
+        func.coalesce(src.chain_name, "Unknown").label("chain_name"),
+        cast(src.original_price, Float).label("original_price"),
+        cast(src.offer_price, Float).label("offer_price"),
+        cast(src.discount_pct, Float).label("discount_pct"),
+        src.discount_type,
+        src.quantity,
+        cast(src.price_per_unit, Float).label("price_per_unit"),
+        src.valid_from,
+        src.valid_to,
+        src.product_image_url.label("image_url"),
+    )
 
-    # Build a CTE: for each product, rank expired offers by valid_to DESC
-    ranked = (
+
+def _previous_offer_lateral(src, today):
+    """LATERAL subquery picking the most recent expired offer per row.
+
+    Always reads the full offers table (expired rows are not in the view),
+    correlated on ``src.product_id`` so PostgreSQL resolves it with one
+    ``idx_offers_prev_lookup`` probe per listed offer.
+    """
+    prev = aliased(Offer)
+    return (
         select(
-            Offer.product_id,
-            Offer.offer_price,
-            Offer.valid_from,
-            Chain.name.label("chain_name"),
-            func.row_number()
-            .over(partition_by=Offer.product_id, order_by=Offer.valid_to.desc())
-            .label("rn"),
+            cast(prev.offer_price, Float).label("previous_price"),
+            prev.valid_from.label("previous_date"),
+            prev.chain_name.label("previous_chain"),
         )
-        .join(Chain, Offer.chain_id == Chain.id)
         .where(
-            Offer.product_id.in_(product_ids),
-            Offer.valid_to < date.today(),
+            prev.product_id == src.product_id,
+            prev.valid_to < today,
         )
-        .cte("ranked_prev")
+        .order_by(prev.valid_to.desc())
+        .limit(1)
+        .lateral("prev")
     )
 
-    query = select(
-        ranked.c.product_id,
-        ranked.c.offer_price,
-        ranked.c.valid_from,
-        ranked.c.chain_name,
-    ).where(ranked.c.rn == 1)
 
-    result = await db.execute(query)
-    rows = result.all()
-
-    return {
-        row.product_id: (row.offer_price, row.valid_from, row.chain_name)
-        for row in rows
-    }
-
-
-def _build_offer_responses(
-    offers: list,
-    previous: dict[uuid.UUID, tuple[Decimal, date, str]],
-) -> list[OfferResponse]:
-    """Build OfferResponse list enriched with previous-price data."""
-    responses = []
-    for o in offers:
-        prev = previous.get(o.product_id)
-        responses.append(
-            OfferResponse(
-                id=o.id,
-                product_id=o.product_id,
-                product_name=o.product.name if o.product else "Unknown",
-                brand=o.product.brand if o.product else None,
-                category=o.product.category if o.product else None,
-                chain_id=o.chain_id,
-                chain_name=o.chain.name if o.chain else "Unknown",
-                original_price=o.original_price,
-                offer_price=o.offer_price,
-                discount_pct=o.discount_pct,
-                discount_type=o.discount_type,
-                quantity=o.quantity,
-                price_per_unit=o.price_per_unit,
-                valid_from=o.valid_from,
-                valid_to=o.valid_to,
-                image_url=o.product.image_url if o.product else None,
-                previous_price=prev[0] if prev else None,
-                previous_date=prev[1] if prev else None,
-                previous_chain=prev[2] if prev else None,
+def _previous_offer_scalars(src, today) -> tuple:
+    """Previous-price columns as correlated scalar subqueries.
+
+    Fallback for dialects without LATERAL (the SQLite test lane): same
+    rows as ``_previous_offer_lateral``, one subquery per column.
+    """
+    prev = aliased(Offer)
+
+    def latest(column):
+        return (
+            select(column)
+            .where(prev.product_id == src.product_id, prev.valid_to < today)
+            .order_by(prev.valid_to.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    return (
+        latest(cast(prev.offer_price, Float)).label("previous_price"),
+        latest(prev.valid_from).label("previous_date"),
+        latest(prev.chain_name).label("previous_chain"),
+    )
+
+
+def _supports_lateral(db: AsyncSession) -> bool:
+    """Whether *db* is on PostgreSQL, the only dialect we use with LATERAL."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _offer_rows_query(src=Offer, today=None, lateral: bool = True):
+    """Base SELECT for offer listings over *src* (``Offer`` or
+    ``ActiveOffer``), plus the previous-price columns.
+
+    *today* defaults to the current date; pass a bind parameter to build a
+    statement that is reused across days. Pass ``lateral=False`` (see
+    ``_supports_lateral``) on databases without LATERAL joins. Filters must
+    use *src*'s denormalized columns; referencing ``Product`` or ``Chain``
+    here would add them to the FROM list.
+    """
+    if today is None:
+        today = date.today()
+    if not lateral:
+        return select(
+            *_offer_columns(src), *_previous_offer_scalars(src, today)
+        ).select_from(src)
+    prev = _previous_offer_lateral(src, today)
+    return (
+        select(*_offer_columns(src), *prev.c)
+        .select_from(src)
+        .outerjoin(prev, true())
+    )
+
+
+def _build_offer_responses(rows: list) -> list[OfferResponse]:
+    """Build OfferResponse list from ``_offer_rows_query()`` mappings.
+
+    Values come straight from the database so validation is skipped.
+    """
+    return [OfferResponse.model_construct(**row) for row in rows]
+
+
+def _offer_rows_response(rows: list) -> ORJSONResponse:
+    """Serialize ``_offer_rows_query()`` mappings straight to JSON.
+
+    The projected columns line up with OfferResponse's fields, so list
+    endpoints skip building (and re-serializing) Pydantic models.
+    """
+    return ORJSONResponse([dict(row) for row in rows])
+
+
+@lru_cache(maxsize=64)
+def _active_offers_query(
+    sort: str,
+    has_chain: bool,
+    has_category: bool,
+    has_min_discount: bool,
+    lateral: bool = True,
+):
+    """Active-offers SELECT for one filter/sort combination, built once.
+
+    Every per-request value is a named bind parameter (filled in by
+    ``_active_offers_statement``), so the statement object is shared across
+    requests and never re-built or re-compiled.
+    """
+    today = bindparam("today", type_=Date)
+    query = _offer_rows_query(ActiveOffer, today, lateral).where(
+        ActiveOffer.valid_from <= today, ActiveOffer.valid_to >= today
+    )
+
+    if has_chain:
+        query = query.where(
+            ActiveOffer.chain_id.in_(
+                select(Chain.id).where(
+                    Chain.slug.in_(bindparam("slugs", expanding=True))
+                )
             )
         )
-    return responses
+
+    if has_category:
+        query = query.where(
+            ActiveOffer.product_category.ilike(bindparam("category_pattern"))
+        )
+
+    if has_min_discount:
+        query = query.where(ActiveOffer.discount_pct >= bindparam("min_discount"))
+
+    if sort == "price":
+        query = query.order_by(ActiveOffer.offer_price)
+    elif sort == "discount":
+        query = query.order_by(ActiveOffer.discount_pct.desc().nulls_last())
+    else:
+        query = query.order_by(ActiveOffer.product_name)
+    return query.offset(bindparam("offset", type_=Integer)).limit(
+        bindparam("limit", type_=Integer)
+    )
+
+
+def _active_offers_statement(
+    chain: str | None,
+    category: str | None,
+    min_discount: float | None,
+    sort: str,
+    limit: int,
+    offset: int,
+    lateral: bool = True,
+):
+    """Return the cached statement for these filters and its parameters."""
+    params = {"today": date.today(), "limit": limit, "offset": offset}
+    if chain:
+        params["slugs"] = [s.strip() for s in chain.split(",")]
+    if category:
+        params["category_pattern"] = f"%{category}%"
+    if min_discount:
+        params["min_discount"] = min_discount
+    if sort not in ("price", "discount"):
+        sort = "name"
+    query = _active_offers_query(
+        sort, bool(chain), bool(category), bool(min_discount), lateral
+    )
+    return query, params
 
 
 @router.get("/active", response_model=list[OfferResponse])
@@ -134,41 +257,53 @@ async def get_active_offers(
     offset: int = Query(0),
     db: AsyncSession = Depends(get_db),
 ):
-    today = date.today()
-    query = (
-        select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
-        .where(Offer.valid_from <= today, Offer.valid_to >= today)
+    query, params = _active_offers_statement(
+        chain, category, min_discount, sort, limit, offset, _supports_lateral(db)
     )
+    result = await db.execute(query, params)
+    return _offer_rows_response(result.mappings().all())
 
-    if chain:
-        slugs = [s.strip() for s in chain.split(",")]
-        query = query.join(Offer.chain).where(Chain.slug.in_(slugs))
 
-    if category:
-        query = query.join(Offer.product).where(
-            Product.category.ilike(f"%{category}%")
-        )
+_STREAM_BATCH_SIZE = 100
 
-    if min_discount:
-        query = query.where(Offer.discount_pct >= min_discount)
 
-    if sort == "price":
-        query = query.order_by(Offer.offer_price)
-    elif sort == "discount":
-        query = query.order_by(Offer.discount_pct.desc().nulls_last())
-    else:
-        query = query.order_by(Product.name)
+async def _stream_offer_rows(*filters):
+    """Yield NDJSON lines, fetching ``_STREAM_BATCH_SIZE`` rows at a time.
 
-    query = query.offset(offset).limit(limit)
-    result = await db.execute(query)
-    offers = result.unique().scalars().all()
+    *filters* are ``_active_offers_statement`` arguments. Opens its own
+    session: the request-scoped one from ``get_db`` is closed before a
+    StreamingResponse body starts being sent.
+    """
+    async with async_session() as session:
+        query, params = _active_offers_statement(*filters, _supports_lateral(session))
+        result = await session.stream(
+            query.execution_options(yield_per=_STREAM_BATCH_SIZE), params
+        )
+        async for partition in result.mappings().partitions():
+            yield b"".join(
+                dumps(dict(row)) + b"\n"
+                for row in partition
+            )
 
-    product_ids = [o.product_id for o in offers]
-    before_dates = {o.product_id: o.valid_from for o in offers if o.valid_from}
-    previous = await _get_previous_prices(product_ids, before_dates, db)
 
-    return _build_offer_responses(offers, previous)
+@router.get("/active/stream")
+async def stream_active_offers(
+    chain: str | None = Query(None, description="Comma-separated chain slugs"),
+    category: str | None = Query(None),
+    min_discount: float | None = Query(None, description="Minimum discount %"),
+    sort: str = Query("price", enum=["price", "discount", "name"]),
+    limit: int = Query(1000, le=10000),
+    offset: int = Query(0),
+):
+    """Active offers as newline-delimited JSON (one OfferResponse per line).
+
+    Rows are serialized as they arrive from PostgreSQL, so memory stays flat
+    regardless of ``limit``.
+    """
+    return StreamingResponse(
+        _stream_offer_rows(chain, category, min_discount, sort, limit, offset),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.get("/historic-lows", response_model=list[OfferResponse])
@@ -191,26 +326,19 @@ async def get_historic_lows(
 
     # Active offers where current price <= historic min * 1.01 (1% tolerance)
     query = (
-        select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
-        .join(min_price_sq, Offer.product_id == min_price_sq.c.product_id)
+        _offer_rows_query(ActiveOffer, lateral=_supports_lateral(db))
+        .join(min_price_sq, ActiveOffer.product_id == min_price_sq.c.product_id)
         .where(
-            Offer.valid_from <= today,
-            Offer.valid_to >= today,
-            Offer.offer_price <= min_price_sq.c.min_price * 1.01,
+            ActiveOffer.valid_from <= today,
+            ActiveOffer.valid_to >= today,
+            ActiveOffer.offer_price <= min_price_sq.c.min_price * 1.01,
         )
-        .order_by(Offer.offer_price)
+        .order_by(ActiveOffer.offer_price)
         .limit(limit)
     )
 
     result = await db.execute(query)
-    offers = result.unique().scalars().all()
-
-    product_ids = [o.product_id for o in offers]
-    before_dates = {o.product_id: o.valid_from for o in offers if o.valid_from}
-    previous = await _get_previous_prices(product_ids, before_dates, db)
-
-    return _build_offer_responses(offers, previous)
+    return _offer_rows_response(result.mappings().all())
 
 
 @router.get("/best", response_model=list[OfferResponse])
@@ -221,30 +349,18 @@ async def get_best_offers(
 ):
     """Best offers sorted by discount percentage."""
     today = date.today()
-    query = (
-        select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
-        .where(
-            Offer.valid_from <= today,
-            Offer.valid_to >= today,
-            Offer.discount_pct.is_not(None),
-        )
+    query = _offer_rows_query(ActiveOffer, lateral=_supports_lateral(db)).where(
+        ActiveOffer.valid_from <= today,
+        ActiveOffer.valid_to >= today,
+        ActiveOffer.discount_pct.is_not(None),
     )
 
     if category:
-        query = query.join(Offer.product).where(
-            Product.category.ilike(f"%{category}%")
-        )
+        query = query.where(ActiveOffer.product_category.ilike(f"%{category}%"))
 
-    query = query.order_by(Offer.discount_pct.desc()).limit(limit)
+    query = query.order_by(ActiveOffer.discount_pct.desc()).limit(limit)
     result = await db.execute(query)
-    offers = result.unique().scalars().all()
-
-    product_ids = [o.product_id for o in offers]
-    before_dates = {o.product_id: o.valid_from for o in offers if o.valid_from}
-    previous = await _get_previous_prices(product_ids, before_dates, db)
-
-    return _build_offer_responses(offers, previous)
+    return _offer_rows_response(result.mappings().all())
 
 
 async def _get_watchlist_product_ids(
@@ -270,25 +386,18 @@ async def get_best_offers_for_watchlist(
 
     today = date.today()
     query = (
-        select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
+        _offer_rows_query(ActiveOffer, lateral=_supports_lateral(db))
         .where(
-            Offer.valid_from <= today,
-            Offer.valid_to >= today,
-            Offer.discount_pct.is_not(None),
-            Offer.product_id.in_(watchlist_ids),
+            ActiveOffer.valid_from <= today,
+            ActiveOffer.valid_to >= today,
+            ActiveOffer.discount_pct.is_not(None),
+            ActiveOffer.product_id.in_(watchlist_ids),
         )
-        .order_by(Offer.discount_pct.desc())
+        .order_by(ActiveOffer.discount_pct.desc())
         .limit(limit)
     )
     result = await db.execute(query)
-    offers = result.unique().scalars().all()
-
-    product_ids = [o.product_id for o in offers]
-    before_dates = {o.product_id: o.valid_from for o in offers if o.valid_from}
-    previous = await _get_previous_prices(product_ids, before_dates, db)
-
-    return _build_offer_responses(offers, previous)
+    return _offer_rows_response(result.mappings().all())
 
 
 @router.get("/historic-lows-for-watchlist", response_model=list[OfferResponse])
@@ -314,24 +423,17 @@ async def get_historic_lows_for_watchlist(
     )
 
     query = (
-        select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
-        .join(min_price_sq, Offer.product_id == min_price_sq.c.product_id)
+        _offer_rows_query(ActiveOffer, lateral=_supports_lateral(db))
+        .join(min_price_sq, ActiveOffer.product_id == min_price_sq.c.product_id)
         .where(
-            Offer.valid_from <= today,
-            Offer.valid_to >= today,
-            Offer.offer_price <= min_price_sq.c.min_price * 1.01,
-            Offer.product_id.in_(watchlist_ids),
+            ActiveOffer.valid_from <= today,
+            ActiveOffer.valid_to >= today,
+            ActiveOffer.offer_price <= min_price_sq.c.min_price * 1.01,
+            ActiveOffer.product_id.in_(watchlist_ids),
         )
-        .order_by(Offer.offer_price)
+        .order_by(ActiveOffer.offer_price)
         .limit(limit)
     )
 
     result = await db.execute(query)
-    offers = result.unique().scalars().all()
-
-    product_ids = [o.product_id for o in offers]
-    before_dates = {o.product_id: o.valid_from for o in offers if o.valid_from}
-    previous = await _get_previous_prices(product_ids, before_dates, db)
-
-    return _build_offer_responses(offers, previous)
+    return _offer_rows_response(result.mappings().all())
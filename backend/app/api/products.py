@@ -12,7 +12,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from sqlalchemy import or_
 
@@ -907,9 +907,14 @@ async def get_catalog_home(
     db: AsyncSession = Depends(get_db),
 ):
     """Home feed for catalog tab: featured offers + per-category sections."""
-    from app.api.offers import OfferResponse, _build_offer_responses, _get_previous_prices
+    from app.api.offers import (
+        _build_offer_responses,
+        _offer_rows_query,
+        _supports_lateral,
+    )
 
     today = date.today()
+    lateral = _supports_lateral(db)
 
     # ── 1. Aggregate product counts by normalised category ──
     cat_query = select(Product.category, func.count()).group_by(Product.category)
@@ -932,8 +937,7 @@ async def get_catalog_home(
 
     # ── 2. Featured offers (top 8 by discount) ──
     feat_query = (
-        select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
+        _offer_rows_query(lateral=lateral)
         .where(
             Offer.valid_from <= today,
             Offer.valid_to >= today,
@@ -943,24 +947,17 @@ async def get_catalog_home(
         .limit(8)
     )
     feat_result = await db.execute(feat_query)
-    featured_offers = feat_result.unique().scalars().all()
-
-    feat_pids = [o.product_id for o in featured_offers]
-    feat_dates = {o.product_id: o.valid_from for o in featured_offers if o.valid_from}
-    feat_prev = await _get_previous_prices(feat_pids, feat_dates, db)
-    featured_data = _build_offer_responses(featured_offers, feat_prev)
+    featured_data = _build_offer_responses(feat_result.mappings().all())
 
     # ── 3. Per-category top 6 offers ──
     categories_data = []
     for cat_name, cat_count in top_categories:
         # Get all raw variants for this normalised category
         raw_variants = cat_raw_variants.get(cat_name, {cat_name})
-        variant_filters = [Product.category.ilike(v) for v in raw_variants]
+        variant_filters = [Offer.product_category.ilike(v) for v in raw_variants]
 
         cat_offer_query = (
-            select(Offer)
-            .options(joinedload(Offer.product), joinedload(Offer.chain))
-            .join(Offer.product)
+            _offer_rows_query(lateral=lateral)
             .where(
                 Offer.valid_from <= today,
                 Offer.valid_to >= today,
@@ -971,15 +968,12 @@ async def get_catalog_home(
             .limit(6)
         )
         cat_offer_result = await db.execute(cat_offer_query)
-        cat_offers = cat_offer_result.unique().scalars().all()
+        cat_offers = cat_offer_result.mappings().all()
 
         if not cat_offers:
             continue
 
-        co_pids = [o.product_id for o in cat_offers]
-        co_dates = {o.product_id: o.valid_from for o in cat_offers if o.valid_from}
-        co_prev = await _get_previous_prices(co_pids, co_dates, db)
-        offers_data = _build_offer_responses(cat_offers, co_prev)
+        offers_data = _build_offer_responses(cat_offers)
 
         slug = cat_name.lower().replace(" ", "-").replace("'", "")
         icon = _CATEGORY_ICONS.get(cat_name, "tag-outline")
@@ -1132,7 +1126,7 @@ async def get_catalog_grouped(
 
     offers_result = await db.execute(
         select(Offer)
-        .options(joinedload(Offer.chain))
+        .options(selectinload(Offer.chain))
         .where(*offers_where)
         .order_by(
             Offer.product_id,
@@ -1140,7 +1134,7 @@ async def get_catalog_grouped(
             Offer.offer_price.asc(),
         )
     )
-    all_offers = offers_result.unique().scalars().all()
+    all_offers = offers_result.scalars().all()
 
     offers_by_product: dict[uuid.UUID, list[Offer]] = defaultdict(list)
     for o in all_offers:
@@ -1154,11 +1148,11 @@ async def get_catalog_grouped(
         from sqlalchemy import desc
         last_offer_result = await db.execute(
             select(Offer)
-            .options(joinedload(Offer.chain))
+            .options(selectinload(Offer.chain))
             .where(Offer.product_id.in_(no_offer_ids))
             .order_by(Offer.product_id, desc(Offer.valid_to))
         )
-        last_offers = last_offer_result.unique().scalars().all()
+        last_offers = last_offer_result.scalars().all()
         for lo in last_offers:
             if lo.product_id not in last_known:
                 last_known[lo.product_id] = (
@@ -1469,7 +1463,7 @@ async def smart_search(
     # Fetch all active offers in one query
     offers_result = await db.execute(
         select(Offer)
-        .options(joinedload(Offer.chain))
+        .options(selectinload(Offer.chain))
         .where(
             Offer.product_id.in_(product_ids),
             Offer.valid_from <= today,
@@ -1477,7 +1471,7 @@ async def smart_search(
         )
         .order_by(Offer.product_id, Offer.price_per_unit.asc().nulls_last(), Offer.offer_price.asc())
     )
-    all_offers = offers_result.unique().scalars().all()
+    all_offers = offers_result.scalars().all()
 
     offers_by_product: dict[uuid.UUID, list[Offer]] = defaultdict(list)
     for o in all_offers:
@@ -1589,7 +1583,7 @@ async def get_product_by_barcode(ean: str, db: AsyncSession = Depends(get_db)):
     today = date.today()
     offers_result = await db.execute(
         select(Offer)
-        .options(joinedload(Offer.chain))
+        .options(selectinload(Offer.chain))
         .where(
             Offer.product_id == product.id,
             Offer.valid_from <= today,
@@ -1597,7 +1591,7 @@ async def get_product_by_barcode(ean: str, db: AsyncSession = Depends(get_db)):
         )
         .order_by(Offer.offer_price)
     )
-    offers = offers_result.unique().scalars().all()
+    offers = offers_result.scalars().all()
 
     from app.services.price_analyzer import PriceAnalyzer
     analyzer = PriceAnalyzer()
@@ -1628,12 +1622,12 @@ async def get_price_history(
 
     offers_result = await db.execute(
         select(Offer)
-        .options(joinedload(Offer.chain))
+        .options(selectinload(Offer.chain))
         .where(Offer.product_id == product_id)
         .order_by(Offer.valid_from.desc())
         .limit(100)
     )
-    offers = offers_result.unique().scalars().all()
+    offers = offers_result.scalars().all()
 
     history = [
         PriceHistoryPoint(
@@ -1743,7 +1737,7 @@ async def compare_prices(
     # Get all active offers for this product + similar products
     offers_result = await db.execute(
         select(Offer)
-        .options(joinedload(Offer.chain), joinedload(Offer.product))
+        .options(selectinload(Offer.chain), selectinload(Offer.product))
         .where(
             Offer.product_id.in_(product_ids),
             Offer.valid_from <= today,
@@ -1751,7 +1745,7 @@ async def compare_prices(
         )
         .order_by(Offer.offer_price)
     )
-    all_offers = offers_result.unique().scalars().all()
+    all_offers = offers_result.scalars().all()
 
     # Keep only the cheapest per chain
     seen_chains: set[uuid.UUID] = set()
@@ -0,0 +1,65 @@
+"""orjson-backed JSON responses and HTTP cache validators."""
+
+import hashlib
+import uuid
+from decimal import Decimal
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+
+def json_default(obj):
+    """orjson fallback for Decimals (as strings, like Pydantic's JSON output)
+    and asyncpg's UUID subclass, which orjson does not serialize natively."""
+    if isinstance(obj, (Decimal, uuid.UUID)):
+        return str(obj)
+    raise TypeError
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(
+        content,
+        default=json_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    Used as the app-wide default, and returned directly by hot list
+    endpoints with plain row dicts to skip Pydantic serialization.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def weak_etag(*parts) -> str:
+    """Weak ETag derived from *parts* (a version tuple or a rendered body).
+
+    Uses a real digest rather than ``hash()``, which is salted per process
+    and would differ between workers.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str, max_age: int = 60) -> Response | None:
+    """Return a 304 if the client's ``If-None-Match`` matches *etag*."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    # If-None-Match uses weak comparison: ignore the W/ prefix.
+    opaque = etag.removeprefix("W/")
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if opaque in tags or "*" in tags:
+        return set_cache_headers(Response(status_code=304), etag, max_age)
+    return None
+
+
+def set_cache_headers(response: Response, etag: str, max_age: int = 60) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
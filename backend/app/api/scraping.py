@@ -90,6 +90,9 @@ async def _run_scraper(chain_slug: str, source: str = "auto") -> dict:
 
     total_products = sum(len(f.get("products", [])) for f in flyers_data)
 
+    from app.jobs.scheduler import refresh_active_offers
+    await refresh_active_offers()
+
     # Trigger notifications
     try:
         from app.services.notification import NotificationService
@@ -226,6 +229,10 @@ async def trigger_iperal_online_sync(_=Depends(require_admin_key)):
 
         scraper = IperalOnlineScraper()
         count = await scraper.scrape()
+
+        from app.jobs.scheduler import refresh_active_offers
+        await refresh_active_offers()
+
         return ScrapeResult(
             status="completed",
             chain="iperal",
@@ -248,6 +255,10 @@ async def trigger_esselunga_online_sync(_=Depends(require_admin_key)):
 
         scraper = EsselungaOnlineScraper()
         count = await scraper.scrape()
+
+        from app.jobs.scheduler import refresh_active_offers
+        await refresh_active_offers()
+
         return ScrapeResult(
             status="completed",
             chain="esselunga",
@@ -270,6 +281,10 @@ async def trigger_carrefour_online_sync(_=Depends(require_admin_key)):
 
         scraper = CarrefourOnlineScraper()
         count = await scraper.scrape()
+
+        from app.jobs.scheduler import refresh_active_offers
+        await refresh_active_offers()
+
         return ScrapeResult(
             status="completed",
             chain="carrefour",
@@ -292,6 +307,10 @@ async def trigger_penny_online_sync(_=Depends(require_admin_key)):
 
         scraper = PennyOnlineScraper()
         count = await scraper.scrape()
+
+        from app.jobs.scheduler import refresh_active_offers
+        await refresh_active_offers()
+
         return ScrapeResult(
             status="completed",
             chain="penny",
@@ -6,9 +6,9 @@ from collections import defaultdict
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Float, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.database import get_db
 from app.models import Store
@@ -46,6 +46,10 @@ class StoreResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class NearStoreResponse(StoreResponse):
+    distance_m: float
+
+
 class NearbyChainInfo(BaseModel):
     chain_name: str
     chain_slug: str
@@ -76,14 +80,14 @@ async def get_nearby_stores(
     lon_delta = radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.5))
 
     result = await db.execute(
-        select(Store).options(joinedload(Store.chain)).where(
+        select(Store).options(selectinload(Store.chain)).where(
             Store.lat.isnot(None),
             Store.lon.isnot(None),
             Store.lat.between(lat - lat_delta, lat + lat_delta),
             Store.lon.between(lon - lon_delta, lon + lon_delta),
         )
     )
-    stores = result.unique().scalars().all()
+    stores = result.scalars().all()
 
     chain_stores: dict[str, list[tuple[float, "Store"]]] = defaultdict(list)
     for s in stores:
@@ -111,19 +115,74 @@ async def get_nearby_stores(
     )
 
 
+def _store_earth_point():
+    """``ll_to_earth(lat, lon)`` for a store -- matches ``idx_stores_earth``."""
+    return func.ll_to_earth(cast(Store.lat, Float), cast(Store.lon, Float))
+
+
+@router.get("/near", response_model=list[NearStoreResponse])
+async def get_stores_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(default=5000, gt=0, le=50_000),
+    limit: int = Query(default=50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """List stores within ``radius_m`` metres, nearest first.
+
+    ``earth_box @> ll_to_earth`` is served by the GiST index on store
+    coordinates; ``earth_distance`` then trims the box corners.
+    """
+    origin = func.ll_to_earth(lat, lon)
+    store_point = _store_earth_point()
+    distance = func.earth_distance(origin, store_point).label("distance_m")
+
+    result = await db.execute(
+        select(Store, distance)
+        .options(selectinload(Store.chain))
+        .where(
+            Store.lat.isnot(None),
+            Store.lon.isnot(None),
+            func.earth_box(origin, radius_m).op("@>")(store_point),
+            func.earth_distance(origin, store_point) <= radius_m,
+        )
+        .order_by(distance)
+        .limit(limit)
+    )
+    return [
+        NearStoreResponse(
+            id=s.id,
+            chain_id=s.chain_id,
+            name=s.name,
+            address=s.address,
+            city=s.city,
+            province=s.province,
+            zip_code=s.zip_code,
+            lat=float(s.lat),
+            lon=float(s.lon),
+            phone=s.phone,
+            opening_hours=s.opening_hours,
+            website_url=s.website_url,
+            chain_name=s.chain.name if s.chain else None,
+            distance_m=round(dist, 1),
+        )
+        for s, dist in result.all()
+    ]
+
+
 @router.get("", response_model=list[StoreResponse])
 async def list_stores(
     city: str | None = Query(None, description="Filter by city"),
     chain: str | None = Query(None, description="Filter by chain slug"),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Store).options(joinedload(Store.chain))
+    query = select(Store).options(selectinload(Store.chain))
     if city:
         query = query.where(Store.city.ilike(f"%{city}%"))
     if chain:
         query = query.join(Store.chain).where(Store.chain.has(slug=chain))
     result = await db.execute(query)
-    stores = result.unique().scalars().all()
+    stores = result.scalars().all()
     return [
         StoreResponse(
             id=s.id,
@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.auth import get_current_user
 from app.database import get_db
@@ -284,38 +284,23 @@ async def get_watchlist(
     today = date.today()
     product_ids = [item.product_id for item in items]
 
-    # Batch query: best offer per product using window function
-    from sqlalchemy import over, literal_column
-    rn = func.row_number().over(
-        partition_by=Offer.product_id,
-        order_by=Offer.offer_price,
-    ).label("rn")
-    ranked_sq = (
-        select(
-            Offer.product_id,
-            Offer.offer_price,
-            Chain.name.label("chain_name"),
-            rn,
-        )
-        .join(Chain, Offer.chain_id == Chain.id)
+    # Batch query: cheapest active offer per product. On PostgreSQL DISTINCT ON
+    # keeps the first row of each product_id group, so no window over every
+    # offer; elsewhere it degrades to a plain DISTINCT and setdefault below
+    # keeps the first (cheapest) row per product instead.
+    best_result = await db.execute(
+        select(Offer.product_id, Offer.offer_price, Offer.chain_name)
+        .distinct(Offer.product_id)
         .where(
             Offer.product_id.in_(product_ids),
             Offer.valid_from <= today,
             Offer.valid_to >= today,
         )
-        .subquery()
-    )
-    best_result = await db.execute(
-        select(
-            ranked_sq.c.product_id,
-            ranked_sq.c.offer_price,
-            ranked_sq.c.chain_name,
-        ).where(ranked_sq.c.rn == 1)
+        .order_by(Offer.product_id, Offer.offer_price)
     )
-    best_map = {
-        str(row.product_id): (row.offer_price, row.chain_name)
-        for row in best_result.all()
-    }
+    best_map: dict[str, tuple] = {}
+    for row in best_result.all():
+        best_map.setdefault(str(row.product_id), (row.offer_price, row.chain_name))
 
     response = []
     for item in items:
@@ -540,7 +525,7 @@ async def get_user_deals(
     # Fetch all active offers for watchlist + similar products
     offers_result = await db.execute(
         select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
+        .options(selectinload(Offer.product), selectinload(Offer.chain))
         .where(
             Offer.product_id.in_(list(all_product_ids)),
             Offer.valid_from <= today,
@@ -548,7 +533,7 @@ async def get_user_deals(
         )
         .order_by(Offer.discount_pct.desc().nulls_last(), Offer.offer_price)
     )
-    offers = offers_result.unique().scalars().all()
+    offers = offers_result.scalars().all()
 
     # Map similar product offers to their watchlist product_id.
     # Keep only the BEST offer per (mapped_product, chain) to avoid
@@ -676,7 +661,7 @@ async def get_alternatives(
     # Find active offers in those categories, excluding watchlist products
     stmt = (
         select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
+        .options(selectinload(Offer.product), selectinload(Offer.chain))
         .join(Product, Offer.product_id == Product.id)
         .where(
             Product.category.in_(categories),
@@ -688,7 +673,7 @@ async def get_alternatives(
         .limit(limit)
     )
     result = await db.execute(stmt)
-    offers = result.unique().scalars().all()
+    offers = result.scalars().all()
 
     return [
         AlternativeResponse(
@@ -739,7 +724,7 @@ async def get_brand_deals(
 
     stmt = (
         select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
+        .options(selectinload(Offer.product), selectinload(Offer.chain))
         .join(Product, Offer.product_id == Product.id)
         .where(
             or_(*brand_conditions),
@@ -750,7 +735,7 @@ async def get_brand_deals(
         .limit(limit)
     )
     result = await db.execute(stmt)
-    offers = result.unique().scalars().all()
+    offers = result.scalars().all()
 
     return [
         BrandDealResponse(
@@ -1361,7 +1346,7 @@ async def _find_alternative_prices(
 
     offers_result = await db.execute(
         select(Offer)
-        .options(joinedload(Offer.chain))
+        .options(selectinload(Offer.chain))
         .where(
             Offer.product_id.in_(list(all_candidate_pids)),
             Offer.valid_from <= today,
@@ -1372,7 +1357,7 @@ async def _find_alternative_prices(
     )
     # Build candidate_pid -> chain_slug -> cheapest (offer, chain)
     pid_chain_offers: dict[uuid.UUID, dict[str, tuple]] = defaultdict(dict)
-    for o in offers_result.unique().scalars().all():
+    for o in offers_result.scalars().all():
         if not o.chain:
             continue
         slug = o.chain.slug
@@ -1497,11 +1482,11 @@ async def compare_shopping_list(
         product_ids = [i.product_id for i in product_items]
         offers_result = await db.execute(
             select(Offer)
-            .options(joinedload(Offer.chain), joinedload(Offer.product))
+            .options(selectinload(Offer.chain), selectinload(Offer.product))
             .where(Offer.product_id.in_(product_ids), *offer_where)
             .order_by(Offer.offer_price)
         )
-        offers = offers_result.unique().scalars().all()
+        offers = offers_result.scalars().all()
 
         # Map product_id -> item_id
         pid_to_item: dict[uuid.UUID, uuid.UUID] = {i.product_id: i.id for i in product_items}
@@ -1531,11 +1516,11 @@ async def compare_shopping_list(
         if all_linked_pids:
             linked_offers_result = await db.execute(
                 select(Offer)
-                .options(joinedload(Offer.chain), joinedload(Offer.product))
+                .options(selectinload(Offer.chain), selectinload(Offer.product))
                 .where(Offer.product_id.in_(all_linked_pids), *offer_where)
                 .order_by(Offer.offer_price)
             )
-            linked_offers = linked_offers_result.unique().scalars().all()
+            linked_offers = linked_offers_result.scalars().all()
 
             # Build product_id -> list of offers
             pid_offers: dict[uuid.UUID, list] = defaultdict(list)
@@ -1761,7 +1746,7 @@ async def get_shopping_list_suggestions(
     # Alternatives: cheaper products in same categories, not in list
     alt_stmt = (
         select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
+        .options(selectinload(Offer.product), selectinload(Offer.chain))
         .join(Product, Offer.product_id == Product.id)
         .where(
             Product.category.in_(list(categories)),
@@ -1775,7 +1760,7 @@ async def get_shopping_list_suggestions(
         alt_stmt = alt_stmt.where(Offer.product_id.notin_(sl_product_ids))
 
     alt_result = await db.execute(alt_stmt)
-    alt_offers = alt_result.unique().scalars().all()
+    alt_offers = alt_result.scalars().all()
 
     # Deduplicate by product_id
     seen_alt: set[uuid.UUID] = set()
@@ -1803,7 +1788,7 @@ async def get_shopping_list_suggestions(
     comp_exclude = sl_product_ids + [uuid.UUID(a.product_id) for a in alternatives]
     comp_stmt = (
         select(Offer)
-        .options(joinedload(Offer.product), joinedload(Offer.chain))
+        .options(selectinload(Offer.product), selectinload(Offer.chain))
         .join(Product, Offer.product_id == Product.id)
         .where(
             Product.category.in_(list(categories)),
@@ -1817,7 +1802,7 @@ async def get_shopping_list_suggestions(
         comp_stmt = comp_stmt.where(Offer.product_id.notin_(comp_exclude))
 
     comp_result = await db.execute(comp_stmt)
-    comp_offers = comp_result.unique().scalars().all()
+    comp_offers = comp_result.scalars().all()
 
     seen_comp: set[uuid.UUID] = set()
     complementary: list[SuggestionItem] = []
@@ -1,13 +1,18 @@
 """Password hashing, JWT creation/validation, and FastAPI auth dependencies."""
 
+import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import cache
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.config import get_settings
 from app.database import get_db
@@ -26,6 +31,28 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+@cache
+def _dummy_hash() -> str:
+    return pwd_context.hash("spesasmart-timing-dummy")
+
+
+async def hash_password_async(plain: str) -> str:
+    """Hash off the event loop; bcrypt is deliberately slow and releases the GIL."""
+    return await asyncio.to_thread(hash_password, plain)
+
+
+async def verify_password_async(plain: str, hashed: str | None) -> bool:
+    """Verify off the event loop.
+
+    With no stored hash (unknown email, OAuth-only account) a dummy hash is
+    still checked so the response time doesn't reveal whether the user exists.
+    """
+    if not hashed:
+        await asyncio.to_thread(verify_password, plain, _dummy_hash())
+        return False
+    return await asyncio.to_thread(verify_password, plain, hashed)
+
+
 def create_access_token(user_id: str, email: str) -> str:
     settings = get_settings()
     expire = datetime.now(timezone.utc) + timedelta(hours=settings.jwt_expire_hours)
@@ -49,6 +76,62 @@ def create_refresh_token(user_id: str) -> str:
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
+# Every authenticated request resolves its user by id, usually the same few
+# users many times per second. Keep a short-lived snapshot of the row's column
+# values (never the ORM object itself, which belongs to one session).
+# Entries are kept in insertion (= timestamp) order, so the oldest ones are
+# evicted first once the cache is full.
+_USER_CACHE_TTL = 10  # seconds
+_USER_CACHE_MAX = 10_000
+_user_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+def clear_user_cache() -> None:
+    """Drop all cached user snapshots."""
+    _user_cache.clear()
+
+
+@event.listens_for(UserProfile, "after_update")
+@event.listens_for(UserProfile, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: UserProfile) -> None:
+    # Only this process's cache; other workers keep their snapshot until it
+    # expires (see _load_user).
+    _user_cache.pop(str(target.id), None)
+
+
+async def _load_user(db: AsyncSession, user_id: str) -> UserProfile | None:
+    """Return the user attached to *db*, served from the snapshot cache when fresh.
+
+    The cache is per process and invalidated only by ORM writes made in the
+    same process, so after a user is changed or deleted other workers may
+    keep authenticating the old row for up to ``_USER_CACHE_TTL`` seconds.
+    """
+    now = time.monotonic()
+    entry = _user_cache.get(user_id)
+    if entry is not None and now - entry[0] < _USER_CACHE_TTL:
+        user = UserProfile(**entry[1])
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(UserProfile).where(UserProfile.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        _user_cache.pop(user_id, None)
+        return None
+
+    _user_cache.pop(user_id, None)
+    while _user_cache:
+        oldest_at = next(iter(_user_cache.values()))[0]
+        if len(_user_cache) < _USER_CACHE_MAX and now - oldest_at < _USER_CACHE_TTL:
+            break
+        _user_cache.popitem(last=False)
+    _user_cache[user_id] = (
+        now,
+        {attr.key: getattr(user, attr.key) for attr in inspect(UserProfile).column_attrs},
+    )
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
@@ -64,8 +147,7 @@ async def get_current_user(
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    result = await db.execute(select(UserProfile).where(UserProfile.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await _load_user(db, user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
@@ -88,5 +170,4 @@ async def get_optional_user(
     except JWTError:
         return None
 
-    result = await db.execute(select(UserProfile).where(UserProfile.id == user_id))
-    return result.scalar_one_or_none()
+    return await _load_user(db, user_id)
@@ -3,6 +3,7 @@
 import re
 import socket
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -54,13 +55,25 @@ def _resolve_database_url(url: str) -> str:
     return url
 
 
-_db_url = _resolve_database_url(settings.database_url)
+# Compiled-statement cache sizes. Each combination of optional list filters
+# compiles to its own statement, so both caches are sized above the
+# defaults (500 SQLAlchemy entries, 100 asyncpg prepared statements per
+# connection) to keep every variant prepared once it has been seen.
+QUERY_CACHE_SIZE = 1200
+PREPARED_STATEMENT_CACHE_SIZE = 500
+
+_db_url = make_url(_resolve_database_url(settings.database_url))
+if _db_url.drivername == "postgresql+asyncpg":
+    _db_url = _db_url.update_query_dict(
+        {"prepared_statement_cache_size": str(PREPARED_STATEMENT_CACHE_SIZE)}
+    )
 
 engine = create_async_engine(
     _db_url,
     echo=settings.debug,
     pool_size=5,
     max_overflow=10,
+    query_cache_size=QUERY_CACHE_SIZE,
 )
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
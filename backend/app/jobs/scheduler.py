@@ -173,6 +173,8 @@ async def scrape_chain(chain_slug: str):
         "Scrape completed for '%s': %d total products.", chain_slug, total_products
     )
 
+    await refresh_active_offers()
+
     # Trigger notifications after scraping
     try:
         from app.services.notification import NotificationService
@@ -248,6 +250,8 @@ async def sync_catalog():
 
     logger.info("Weekly catalog sync complete: %d total products processed.", total)
 
+    await refresh_active_offers()
+
     # Post-sync image backfill for newly added products
     try:
         from app.database import async_session as get_session
@@ -428,6 +432,25 @@ async def cleanup_expired_offers():
         logger.info("Deleted %d expired offers (valid_to < %s).", result.rowcount, cutoff)
 
 
+async def refresh_active_offers():
+    """Refresh the offers_active materialized view.
+
+    Runs after every scrape and nightly, so offers that expired at midnight
+    drop out and newly scraped ones show up in the listing endpoints.
+    """
+    from sqlalchemy import text
+    from app.database import async_session
+    from app.models.offer import REFRESH_OFFERS_ACTIVE_SQL
+
+    try:
+        async with async_session() as session:
+            await session.execute(text(REFRESH_OFFERS_ACTIVE_SQL))
+            await session.commit()
+        logger.info("Refreshed offers_active view.")
+    except Exception:
+        logger.exception("offers_active refresh failed.")
+
+
 def start_scheduler() -> AsyncIOScheduler:
     """Configure and start the APScheduler."""
     scheduler = AsyncIOScheduler(timezone=TZ)
@@ -596,6 +619,16 @@ def start_scheduler() -> AsyncIOScheduler:
         replace_existing=True,
     )
 
+    # Active offers view: just after midnight, plus hourly to pick up
+    # offers ingested outside scrape_chain (admin triggers, scripts)
+    scheduler.add_job(
+        refresh_active_offers,
+        CronTrigger(minute=5, timezone=TZ),
+        id="refresh_active_offers",
+        name="Refresh offers_active materialized view",
+        replace_existing=True,
+    )
+
     # Purchase history sync: daily at 5:00 AM
     scheduler.add_job(
         sync_all_purchase_histories,
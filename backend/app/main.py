@@ -1,6 +1,7 @@
 """SpesaSmart API - Main FastAPI application."""
 
 import logging
+import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -19,6 +20,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api import admin, auth, chains, flyers, offers, products, purchases, remote_login, scraping, shopping_lists, stores, users
 from app.api import web_push
+from app.api.responses import ORJSONResponse
 from app.config import get_settings
 from app.database import async_session
 
@@ -40,6 +42,12 @@ async def lifespan(app: FastAPI):
     else:
         yield
 
+    # Only close the browser pool if something in this process scraped;
+    # importing the scraper here would pull in Playwright on every API worker.
+    promoqui = sys.modules.get("app.scrapers.promoqui")
+    if promoqui is not None:
+        await promoqui.BROWSER_POOL.close()
+
 
 settings = get_settings()
 
@@ -48,6 +56,7 @@ app = FastAPI(
     description="API per il confronto prezzi dei supermercati in Monza e Brianza",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 class NoCdnCacheMiddleware(BaseHTTPMiddleware):
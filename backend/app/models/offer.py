@@ -4,8 +4,23 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Text,
+    event,
+    select,
+)
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -48,7 +63,189 @@ class Offer(Base):
         DateTime(timezone=True), server_default=func.now()
     )
 
+    # Read-only copies of product/chain fields so offer listings need no
+    # joins. Maintained by database triggers (see OFFER_DENORM_DDL).
+    product_name: Mapped[str | None] = mapped_column(String(300))
+    product_brand: Mapped[str | None] = mapped_column(String(200))
+    product_category: Mapped[str | None] = mapped_column(String(100))
+    product_image_url: Mapped[str | None] = mapped_column(Text)
+    chain_name: Mapped[str | None] = mapped_column(String(100))
+
     product = relationship("Product", back_populates="offers")
     flyer = relationship("Flyer", back_populates="offers")
     chain = relationship("Chain", back_populates="offers")
     store = relationship("Store", back_populates="offers")
+
+
+# Triggers keeping the denormalized offer columns in sync: offers copy the
+# fields on insert / product or chain change, and renames on products or
+# chains fan out to their offers. Installed by migration 030, and by the
+# after_create hooks below for schemas built with metadata.create_all().
+OFFER_DENORM_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION offers_fill_denorm() RETURNS trigger AS $$
+    BEGIN
+        SELECT p.name, p.brand, p.category, p.image_url
+          INTO NEW.product_name, NEW.product_brand, NEW.product_category, NEW.product_image_url
+          FROM products p WHERE p.id = NEW.product_id;
+        SELECT c.name INTO NEW.chain_name FROM chains c WHERE c.id = NEW.chain_id;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_offers_fill_denorm
+        BEFORE INSERT OR UPDATE OF product_id, chain_id ON offers
+        FOR EACH ROW EXECUTE FUNCTION offers_fill_denorm()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION products_sync_offers() RETURNS trigger AS $$
+    BEGIN
+        UPDATE offers
+           SET product_name = NEW.name, product_brand = NEW.brand,
+               product_category = NEW.category, product_image_url = NEW.image_url
+         WHERE product_id = NEW.id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_products_sync_offers
+        AFTER UPDATE OF name, brand, category, image_url ON products
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name
+              OR OLD.brand IS DISTINCT FROM NEW.brand
+              OR OLD.category IS DISTINCT FROM NEW.category
+              OR OLD.image_url IS DISTINCT FROM NEW.image_url)
+        EXECUTE FUNCTION products_sync_offers()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION chains_sync_offers() RETURNS trigger AS $$
+    BEGIN
+        UPDATE offers SET chain_name = NEW.name WHERE chain_id = NEW.id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_chains_sync_offers
+        AFTER UPDATE OF name ON chains
+        FOR EACH ROW
+        WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION chains_sync_offers()
+    """,
+)
+
+for _stmt in OFFER_DENORM_DDL:
+    event.listen(
+        Offer.__table__,
+        "after_create",
+        DDL(_stmt).execute_if(dialect="postgresql"),
+    )
+
+
+# Materialized view of offers that have not expired, so listing endpoints
+# scan thousands of rows instead of the whole offer history. Refreshed at
+# the end of every scrape and catalog sync, and hourly at :05
+# (app.jobs.scheduler.refresh_active_offers); offers written any other way
+# (scripts, direct SQL) stay hidden from listings until that hourly run.
+# Readers still apply the validity predicate since rows can lag by one refresh.
+# The Table lives outside Base.metadata so create_all() doesn't build it
+# as a real table; OFFERS_ACTIVE_DDL creates the view instead. Other
+# dialects (the SQLite test lane) have no view, so there it compiles to
+# the equivalent filtered SELECT over offers.
+OFFERS_ACTIVE_COLUMNS = (
+    "id",
+    "product_id",
+    "flyer_id",
+    "chain_id",
+    "store_id",
+    "original_price",
+    "offer_price",
+    "discount_pct",
+    "discount_type",
+    "quantity",
+    "price_per_unit",
+    "unit_reference",
+    "valid_from",
+    "valid_to",
+    "product_name",
+    "product_brand",
+    "product_category",
+    "product_image_url",
+    "chain_name",
+)
+
+
+class _OffersActiveTable(Table):
+    inherit_cache = True
+
+
+offers_active = _OffersActiveTable(
+    "offers_active",
+    MetaData(),
+    *(
+        Column(name, Offer.__table__.c[name].type, primary_key=(name == "id"))
+        for name in OFFERS_ACTIVE_COLUMNS
+    ),
+)
+
+# Installed by migration 031, and by the after_create hooks below for
+# create_all() schemas.
+OFFERS_ACTIVE_DDL = (
+    f"""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS offers_active AS
+    SELECT {", ".join(OFFERS_ACTIVE_COLUMNS)}
+    FROM offers
+    WHERE valid_to >= CURRENT_DATE
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_offers_active_id ON offers_active (id)",
+    "CREATE INDEX IF NOT EXISTS idx_offers_active_mv_price ON offers_active (offer_price)",
+    "CREATE INDEX IF NOT EXISTS idx_offers_active_mv_discount "
+    "ON offers_active (discount_pct DESC NULLS LAST)",
+    "CREATE INDEX IF NOT EXISTS idx_offers_active_mv_product ON offers_active (product_id)",
+)
+
+# Trigram index behind the category ILIKE filter, as migration 032 adds it;
+# skipped (not fatal) on create_all() databases without the pg_trgm module.
+OFFERS_ACTIVE_TRGM_DDL = (
+    """
+    DO $$
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS ix_offers_active_category_trgm
+            ON offers_active USING gin (product_category gin_trgm_ops);
+    EXCEPTION WHEN feature_not_supported OR undefined_file THEN
+        RAISE NOTICE 'pg_trgm unavailable, skipping ix_offers_active_category_trgm';
+    END
+    $$
+    """,
+)
+
+
+@compiles(_OffersActiveTable)
+def _compile_offers_active(element, compiler, asfrom=False, **kw):
+    if compiler.dialect.name == "postgresql" or not asfrom:
+        return compiler.visit_table(element, asfrom=asfrom, **kw)
+    offers = Offer.__table__
+    fallback = (
+        select(*(offers.c[name] for name in OFFERS_ACTIVE_COLUMNS))
+        .where(offers.c.valid_to >= func.current_date())
+        .subquery(element.name)
+    )
+    return compiler.process(fallback, asfrom=True, **kw)
+
+
+REFRESH_OFFERS_ACTIVE_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY offers_active"
+
+for _stmt in OFFERS_ACTIVE_DDL + OFFERS_ACTIVE_TRGM_DDL:
+    event.listen(
+        Offer.__table__,
+        "after_create",
+        DDL(_stmt).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    Offer.__table__,
+    "before_drop",
+    DDL("DROP MATERIALIZED VIEW IF EXISTS offers_active").execute_if(dialect="postgresql"),
+)
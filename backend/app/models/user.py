@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text, UniqueConstraint
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -18,7 +18,7 @@ class UserProfile(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    email: Mapped[str | None] = mapped_column(String(255), unique=True, index=True)
+    email: Mapped[str | None] = mapped_column(String(255))
     password_hash: Mapped[str | None] = mapped_column(String(128))
     telegram_chat_id: Mapped[int | None] = mapped_column(BigInteger)
     push_token: Mapped[str | None] = mapped_column(Text)
@@ -50,6 +50,10 @@ class UserProfile(Base):
     purchase_orders = relationship("PurchaseOrder", back_populates="user", cascade="all, delete-orphan")
 
 
+# Emails are unique case-insensitively; lookups go through lower(email).
+Index("ix_user_profiles_email_lower", func.lower(UserProfile.email), unique=True)
+
+
 class UserWatchlist(Base):
     __tablename__ = "user_watchlist"
     __table_args__ = (
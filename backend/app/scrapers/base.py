@@ -7,6 +7,7 @@ import logging
 import re
 from abc import ABC, abstractmethod
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +21,66 @@ logger = logging.getLogger(__name__)
 # Directory where downloaded images / screenshots are stored.
 IMAGES_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "images"
 
+_NON_PRICE_CHARS = re.compile(r"[^\d.]")
+_DISCOUNT_PCT_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*%")
+
+
+# Flyers repeat a small set of price strings ("1,99", "-30%") many times,
+# so the parsers are memoized; ``Decimal`` is immutable and safe to share.
+@lru_cache(maxsize=8192)
+def _parse_price(raw: str | None) -> Decimal | None:
+    if not raw:
+        return None
+
+    text = raw.strip().lower()
+    # Strip known currency markers.
+    for token in ("eur", "euro", "\u20ac"):
+        text = text.replace(token, "")
+    text = text.strip()
+
+    if not text:
+        return None
+
+    # Determine Italian vs English format:
+    # Italian: 1.299,50  --  period is thousands sep, comma is decimal.
+    # English: 1,299.50  --  comma is thousands sep, period is decimal.
+    # Simple heuristic: if the *last* separator is a comma, treat as Italian.
+    last_comma = text.rfind(",")
+    last_dot = text.rfind(".")
+
+    if last_comma > last_dot:
+        # Italian format: strip dots (thousands), replace comma -> dot.
+        text = text.replace(".", "").replace(",", ".")
+    elif last_dot > last_comma:
+        # English format (or no comma at all): strip commas (thousands).
+        text = text.replace(",", "")
+    else:
+        # Neither comma nor dot -- just digits.
+        pass
+
+    # Remove anything that is not digit or dot.
+    text = _NON_PRICE_CHARS.sub("", text)
+
+    try:
+        return Decimal(text)
+    except (InvalidOperation, ValueError):
+        logger.debug("Could not parse price from '%s'", raw)
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _parse_discount_pct(raw: str | None) -> Decimal | None:
+    if not raw:
+        return None
+    match = _DISCOUNT_PCT_RE.search(raw)
+    if not match:
+        return None
+    value = match.group(1).replace(",", ".")
+    try:
+        return Decimal(value)
+    except (InvalidOperation, ValueError):
+        return None
+
 
 class BaseScraper(ABC):
     """Base class every chain-specific scraper must extend.
@@ -212,57 +273,12 @@ class BaseScraper(ABC):
         Handles formats like ``"3,99"`` ``"3.99"`` ``"EUR 1.299,50"``
         ``"1,50 euro"`` etc.  Returns ``None`` when parsing fails.
         """
-        if not raw:
-            return None
-
-        text = raw.strip().lower()
-        # Strip known currency markers.
-        for token in ("eur", "euro", "\u20ac"):
-            text = text.replace(token, "")
-        text = text.strip()
-
-        if not text:
-            return None
-
-        # Determine Italian vs English format:
-        # Italian: 1.299,50  --  period is thousands sep, comma is decimal.
-        # English: 1,299.50  --  comma is thousands sep, period is decimal.
-        # Simple heuristic: if the *last* separator is a comma, treat as Italian.
-        last_comma = text.rfind(",")
-        last_dot = text.rfind(".")
-
-        if last_comma > last_dot:
-            # Italian format: strip dots (thousands), replace comma -> dot.
-            text = text.replace(".", "").replace(",", ".")
-        elif last_dot > last_comma:
-            # English format (or no comma at all): strip commas (thousands).
-            text = text.replace(",", "")
-        else:
-            # Neither comma nor dot -- just digits.
-            pass
-
-        # Remove anything that is not digit or dot.
-        text = re.sub(r"[^\d.]", "", text)
-
-        try:
-            return Decimal(text)
-        except (InvalidOperation, ValueError):
-            logger.debug("Could not parse price from '%s'", raw)
-            return None
+        return _parse_price(raw)
 
     @staticmethod
     def normalize_discount_pct(raw: str | None) -> Decimal | None:
         """Extract a discount percentage from strings like ``'-30%'``, ``'sconto 25%'``."""
-        if not raw:
-            return None
-        match = re.search(r"(\d+(?:[.,]\d+)?)\s*%", raw)
-        if not match:
-            return None
-        value = match.group(1).replace(",", ".")
-        try:
-            return Decimal(value)
-        except (InvalidOperation, ValueError):
-            return None
+        return _parse_discount_pct(raw)
 
     # ------------------------------------------------------------------
     # Product dedup via ProductMatcher
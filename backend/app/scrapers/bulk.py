@@ -0,0 +1,83 @@
+"""Bulk offer ingest using PostgreSQL ``COPY``.
+
+Scrapers that persist a whole flyer at once collect their offers as plain
+dicts and hand them to :func:`copy_offers`, which streams them into the
+``offers`` table with a single binary ``COPY`` instead of one ``INSERT``
+per row.  The copy runs on the session's own connection, so it commits or
+rolls back together with the rest of the session's work.
+
+``COPY`` bypasses ORM-side defaults, so ``id`` is generated here; server
+defaults (``created_at``, ``ppu_computed``) and the ``offers_fill_denorm``
+trigger still apply.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.offer import Offer
+
+logger = logging.getLogger(__name__)
+
+# Columns a scraper may provide for each offer row; missing keys become NULL.
+OFFER_COPY_COLUMNS: tuple[str, ...] = (
+    "id",
+    "product_id",
+    "flyer_id",
+    "chain_id",
+    "store_id",
+    "original_price",
+    "offer_price",
+    "discount_pct",
+    "discount_type",
+    "quantity",
+    "price_per_unit",
+    "unit_reference",
+    "ppu_computed",
+    "valid_from",
+    "valid_to",
+    "raw_text",
+    "confidence",
+)
+
+
+async def copy_offers(session: AsyncSession, offers: list[dict[str, Any]]) -> int:
+    """Insert *offers* into the ``offers`` table in one round-trip.
+
+    Each item is a dict keyed by names from :data:`OFFER_COPY_COLUMNS`.
+    Uses asyncpg's ``copy_records_to_table`` when available and falls back
+    to an executemany ``INSERT`` on other drivers.
+
+    Returns:
+        The number of rows written.
+    """
+    if not offers:
+        return 0
+
+    rows = [
+        {
+            **{col: offer.get(col) for col in OFFER_COPY_COLUMNS},
+            "id": offer.get("id") or uuid.uuid4(),
+            "ppu_computed": bool(offer.get("ppu_computed", False)),
+        }
+        for offer in offers
+    ]
+
+    conn = await session.connection()
+    if conn.dialect.driver != "asyncpg":
+        await session.execute(insert(Offer.__table__), rows)
+        return len(rows)
+
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        Offer.__tablename__,
+        records=[tuple(row[col] for col in OFFER_COPY_COLUMNS) for row in rows],
+        columns=list(OFFER_COPY_COLUMNS),
+    )
+    logger.debug("Copied %d offers.", len(rows))
+    return len(rows)
@@ -4,25 +4,42 @@ This scraper serves as an alternative data source when direct chain scraping
 (Gemini OCR) is unavailable. PromoQui aggregates flyer offers from Italian
 supermarkets in structured HTML format.
 
+The offer cards are server-rendered, so the first batch is fetched with
+plain httpx + BeautifulSoup.  Further batches come from the JSON endpoint
+behind the "CARICA ALTRE OFFERTE" button: a browser run records it (and
+its paging parameter) in ``backend/data/promoqui_api.json``, and later
+runs call it directly with httpx.  Playwright is only started when no
+recorded endpoint works.
+
 Supported chains: esselunga, coop, iperal, lidl, carrefour, conad, eurospin,
                   aldi, md-discount, penny, pam
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import re
 import uuid
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+import httpx
+from bs4 import BeautifulSoup
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout, async_playwright
 
+from app.config import get_settings
 from app.database import async_session
 from app.models.chain import Chain
 from app.models.flyer import Flyer
+from app.models.product import Product
 from app.scrapers.base import BaseScraper
+from app.scrapers.bulk import copy_offers
+from app.services.product_matcher import ProductMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +58,247 @@ PROMOQUI_CHAINS = {
     "pam": "pam",
 }
 
+# No Accept-Language on purpose: a locale makes PromoQui geo-lock the
+# catalog to a handful of local offers (see ``BrowserPool``).
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+# Offer cards carry a generated ``OffersList_offer__<hash>`` class; their
+# sub-elements share the prefix, so these fragments rule them out.
+_CARD_CLASS_PREFIX = "OffersList_offer__"
+_CARD_CLASS_EXCLUDE = (
+    "image",
+    "information",
+    "description",
+    "title",
+    "offerItem",
+    "mobilePrice",
+    "infosRetailer",
+    "buttonIcon",
+)
+_LOAD_MORE_TEXT = "CARICA ALTRE OFFERTE"
+
+# The scraper only reads DOM text and attributes (``img.src`` included), so
+# the browser never needs to download these.  Analytics hosts are matched
+# on hostname substrings.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet", "websocket"})
+_BLOCKED_HOSTS = ("googletagmanager", "google-analytics", "doubleclick", "facebook", "hotjar")
+
+# Resolves the card's generated class (e.g. ``OffersList_offer__vyBiG``)
+# once and caches it in ``window.__pqCardClass``; sub-elements carry longer
+# classes (``OffersList_offer__image__*``), so the exact class matches cards
+# only and ``getElementsByClassName`` can replace substring selectors.
+_CARD_CLASS_JS = """
+    const cardClass = () => {
+        if (window.__pqCardClass) return window.__pqCardClass;
+        for (const el of document.querySelectorAll('[class*="%s"]')) {
+            for (const c of el.classList) {
+                if (/^%s[A-Za-z0-9]+$/.test(c)) return (window.__pqCardClass = c);
+            }
+        }
+        return null;
+    };
+""" % (_CARD_CLASS_PREFIX, _CARD_CLASS_PREFIX)
+
+# Sets up the per-round card count.  With the card class resolved it is the
+# live HTMLCollection's length; otherwise a MutationObserver keeps
+# ``window.__pqCount`` current by inspecting only added/removed subtrees.
+# Either way each "load more" round reads a number instead of re-walking
+# the whole, growing DOM.
+_CARD_COUNTER_INSTALL_JS = """() => {
+    %s
+    const cls = cardClass();
+    if (cls) {
+        window.__pqCards = document.getElementsByClassName(cls);
+        return window.__pqCards.length;
+    }
+    if (window.__pqObserver) return window.__pqCount;
+    const exclude = %s;
+    const isCard = el => {
+        const cls = typeof el.className === 'string' ? el.className : '';
+        return cls.includes('%s') && !exclude.some(f => cls.includes(f));
+    };
+    const countIn = node => {
+        if (node.nodeType !== 1) return 0;
+        let n = isCard(node) ? 1 : 0;
+        for (const el of node.querySelectorAll('[class*="%s"]')) if (isCard(el)) n++;
+        return n;
+    };
+    window.__pqCount = countIn(document.body);
+    window.__pqObserver = new MutationObserver(mutations => {
+        for (const m of mutations) {
+            for (const node of m.addedNodes) window.__pqCount += countIn(node);
+            for (const node of m.removedNodes) window.__pqCount -= countIn(node);
+        }
+    });
+    window.__pqObserver.observe(document.body, {childList: true, subtree: true});
+    return window.__pqCount;
+}""" % (
+    _CARD_CLASS_JS,
+    json.dumps(list(_CARD_CLASS_EXCLUDE)),
+    _CARD_CLASS_PREFIX,
+    _CARD_CLASS_PREFIX,
+)
+
+# Scroll, click "CARICA ALTRE OFFERTE" and recount until nothing new loads.
+# PromoQui uses React; Playwright's click() doesn't always trigger the React
+# event handler, but native JS .click() does.  Matches the button text
+# exactly to avoid clicking unrelated buttons.
+_LOAD_ALL_JS = """async (maxLoads) => {
+    const initial = (%s)();
+    const count = () => window.__pqCards ? window.__pqCards.length : window.__pqCount;
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    let prev = initial, stuck = 0, rounds = 0;
+    while (rounds < maxLoads) {
+        rounds++;
+        window.scrollTo(0, document.body.scrollHeight);
+        await sleep(1000);
+        const btn = [...document.querySelectorAll('button')].find(b =>
+            b.innerText.trim().toUpperCase() === '%s' &&
+            b.offsetParent !== null && b.offsetHeight > 0);
+        if (btn) {
+            btn.scrollIntoView({behavior: 'instant', block: 'center'});
+            btn.click();
+            await sleep(3000);
+        }
+        const n = count();
+        stuck = n > prev ? 0 : stuck + 1;
+        prev = n;
+        if (!btn && stuck >= 3) break;
+    }
+    return {initial: initial, rounds: rounds, count: prev};
+}""" % (_CARD_COUNTER_INSTALL_JS, _LOAD_MORE_TEXT)
+
+PROMOQUI_API_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "promoqui_api.json"
+# Cookies/localStorage of the shared browser context, so the consent
+# dialog is answered once rather than on every run.
+PROMOQUI_STATE_PATH = PROMOQUI_API_PATH.with_name("promoqui_state.json")
+_CONSENT_COOKIES = frozenset({"didomi_token", "euconsent-v2", "OptanonAlertBoxClosed"})
+
+# Pages of the JSON endpoint fetched concurrently per round.
+_API_PAGE_WINDOW = 5
+_API_MAX_PAGES = 50
+
+# Products matched and COPY-ed per round while later batches are still loading.
+_PERSIST_BATCH = 50
+
+# Candidate keys when mapping the endpoint's offer objects to card items.
+_JSON_NAME_KEYS = ("title", "name", "productName", "description")
+_JSON_PRICE_KEYS = ("price", "offerPrice", "currentPrice", "salePrice")
+_JSON_ORIGINAL_KEYS = ("originalPrice", "oldPrice", "fullPrice", "regularPrice", "previousPrice")
+_JSON_DISCOUNT_KEYS = ("discount", "discountPercentage", "discountPct")
+_JSON_IMAGE_KEYS = ("image", "imageUrl", "image_url", "thumbnail")
+
+_PRICE_RE = re.compile(r"(\d+[,.]\d{2})\s*€")
+_DISCOUNT_RE = re.compile(r"-\s*(\d+)\s*%")
+_QTY_RE = re.compile(r"(\d+(?:[,.]\d+)?\s*(?:g|kg|ml|l|cl|pz|pezzi|conf)\b)", re.I)
+
+# Card text kept on the offer, whitespace-collapsed and capped once at parse time.
+_RAW_TEXT_MAX = 500
+
+
+class BrowserPool:
+    """One Chromium + context shared by every PromoQui scraper in the process.
+
+    The context is deliberately plain (no locale/UA): PromoQui geo-localizes
+    on those headers and shows only local offers (e.g. 4 items in Milan),
+    while a clean context gets the full national catalog (e.g. 282 items).
+
+    ``acquire()`` hands out a fresh page, at most *size* at a time;
+    ``release()`` closes it.  The browser stays up until ``close()``.
+    """
+
+    def __init__(self, size: int = 4) -> None:
+        self._semaphore = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    async def _get_context(self):
+        async with self._lock:
+            if self._context is None:
+                settings = get_settings()
+                try:
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=settings.scraping_headless
+                    )
+                    self._context = await self._browser.new_context(
+                        viewport={"width": 1920, "height": 1080},
+                        storage_state=(
+                            PROMOQUI_STATE_PATH if PROMOQUI_STATE_PATH.exists() else None
+                        ),
+                    )
+                    await self._context.route("**/*", _route_lean)
+                except BaseException:
+                    await self._shutdown()
+                    raise
+                self._context.set_default_timeout(settings.scraping_timeout)
+            return self._context
+
+    async def acquire(self) -> Page:
+        await self._semaphore.acquire()
+        try:
+            context = await self._get_context()
+            return await context.new_page()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def release(self, page: Page) -> None:
+        try:
+            await page.close()
+        finally:
+            self._semaphore.release()
+
+    async def save_state(self) -> None:
+        """Persist the context's cookies/localStorage to ``PROMOQUI_STATE_PATH``."""
+        if self._context is None:
+            return
+        try:
+            PROMOQUI_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            await self._context.storage_state(path=PROMOQUI_STATE_PATH)
+        except Exception:
+            logger.warning("Could not save PromoQui browser state.", exc_info=True)
+
+    async def close(self) -> None:
+        """Shut the shared browser down (called on app shutdown)."""
+        async with self._lock:
+            await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        if self._context is not None:
+            await self._context.close()
+            self._context = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+BROWSER_POOL = BrowserPool()
+
+
+async def _route_lean(route) -> None:
+    """Abort requests for assets and trackers the scraper never reads."""
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+        blocked in host for blocked in _BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class PromoQuiScraper(BaseScraper):
     """Scraper that pulls offers from promoqui.it for a given chain."""
@@ -56,27 +314,46 @@ class PromoQuiScraper(BaseScraper):
         # Override name/slug to match the actual chain
         self.name = self.chain_name
         self.slug = chain_slug
+        self._api_urls: list[str] = []
         super().__init__()
 
-    async def _new_page_plain(self) -> Page:
-        """Create a plain browser page without locale/UA that triggers geo-lock.
-
-        PromoQui geo-localizes based on locale/UA headers and shows only
-        local offers (e.g. 4 items in Milan).  A clean context without
-        these headers shows the full national catalog (e.g. 282 items).
+    @classmethod
+    async def scrape_all(
+        cls,
+        chain_slugs: tuple[str, ...] = ("esselunga", "coop", "iperal", "lidl"),
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Scrape several chains concurrently.
+
+        Each scraper has its own HTTP client and DB sessions; browser pages
+        come from the shared ``BROWSER_POOL``.  A chain that fails maps to
+        an empty list rather than aborting the others.  The offers_active
+        view is refreshed once all chains have finished.
         """
-        from playwright.async_api import async_playwright as ap
+        from app.jobs.scheduler import refresh_active_offers
 
-        if self._context is None:
-            self._playwright = await ap().start()
-            self._browser = await self._playwright.chromium.launch(
-                headless=self.settings.scraping_headless
-            )
-            self._context = await self._browser.new_context(
-                viewport={"width": 1920, "height": 1080},
+        scrapers = [cls(slug) for slug in chain_slugs]
+        results = await asyncio.gather(
+            *(scraper.scrape() for scraper in scrapers), return_exceptions=True
+        )
+        await refresh_active_offers()
+        out: dict[str, list[dict[str, Any]]] = {}
+        for slug, result in zip(chain_slugs, results):
+            if isinstance(result, BaseException):
+                logger.error("PromoQui scrape failed for '%s': %r", slug, result)
+                out[slug] = []
+            else:
+                out[slug] = result
+        return out
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Shared client without the base class's Italian locale headers."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0),
+                follow_redirects=True,
+                headers=_HEADERS,
             )
-            self._context.set_default_timeout(self.settings.scraping_timeout)
-        return await self._context.new_page()
+        return self._http_client
 
     async def scrape(self) -> list[dict[str, Any]]:
         """Scrape offers for the configured chain from PromoQui."""
@@ -88,48 +365,50 @@ class PromoQuiScraper(BaseScraper):
         url = f"{self.base_url}/offerte/{pq_slug}"
         flyers_data: list[dict[str, Any]] = []
 
-        try:
-            page = await self._new_page_plain()
-            logger.info("Navigating to PromoQui: %s", url)
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await self._accept_cookies(page)
-            await page.wait_for_timeout(2000)
+        today = date.today()
+        days_since_monday = today.weekday()
+        valid_from = today - timedelta(days=days_since_monday)
+        valid_to = valid_from + timedelta(days=13)  # 2 weeks typical
+
+        flyer_data = {
+            "chain": self.chain_name,
+            "slug": self.chain_slug,
+            "title": f"Offerte {self.chain_name} (PromoQui)",
+            "source_url": url,
+            "valid_from": valid_from,
+            "valid_to": valid_to,
+            "products": [],
+            "image_paths": [],
+            "store_id": self.store_id,
+        }
 
-            # Load ALL offers by clicking "CARICA ALTRE OFFERTE" up to 50 times
-            await self._load_all_offers(page)
+        try:
+            if await self._flyer_exists(url, valid_from, valid_to):
+                logger.info(
+                    "PromoQui flyer for '%s' (%s to %s) already persisted, skipping scrape.",
+                    self.chain_slug,
+                    valid_from,
+                    valid_to,
+                )
+                return []
 
-            # Extract products
-            products = await self._extract_offers(page)
+            # Fetching (HTTP/API/browser) and DB writes overlap: each fetched
+            # batch of cards is queued and persisted while the next one loads.
+            batches: asyncio.Queue[list[dict[str, Any]] | None] = asyncio.Queue()
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._collect_items(url, batches))
+                tg.create_task(self._persist_offers(flyer_data, batches))
 
-            if not products:
+            if not flyer_data["products"]:
                 logger.info("No offers found for '%s' on PromoQui.", self.chain_slug)
                 return []
 
             # NO food filter -- load EVERYTHING into the catalog
             logger.info(
                 "Extracted %d total products for '%s' from PromoQui.",
-                len(products),
+                len(flyer_data["products"]),
                 self.chain_slug,
             )
-
-            today = date.today()
-            days_since_monday = today.weekday()
-            valid_from = today - timedelta(days=days_since_monday)
-            valid_to = valid_from + timedelta(days=13)  # 2 weeks typical
-
-            flyer_data = {
-                "chain": self.chain_name,
-                "slug": self.chain_slug,
-                "title": f"Offerte {self.chain_name} (PromoQui)",
-                "source_url": url,
-                "valid_from": valid_from,
-                "valid_to": valid_to,
-                "products": products,
-                "image_paths": [],
-                "store_id": self.store_id,
-            }
-
-            await self._persist_offers(flyer_data)
             flyers_data.append(flyer_data)
 
         except Exception:
@@ -139,12 +418,194 @@ class PromoQuiScraper(BaseScraper):
 
         return flyers_data
 
+    async def _flyer_exists(self, url: str, valid_from: date, valid_to: date) -> bool:
+        """Whether this chain's flyer for *url* and dates is already stored,
+        checked before any network or browser work."""
+        from sqlalchemy import select
+
+        async with async_session() as session:
+            result = await session.execute(
+                select(Flyer.id)
+                .join(Chain, Flyer.chain_id == Chain.id)
+                .where(
+                    Chain.slug == self.chain_slug,
+                    Flyer.source_url == url,
+                    Flyer.valid_from == valid_from,
+                    Flyer.valid_to == valid_to,
+                )
+                .limit(1)
+            )
+            return result.first() is not None
+
+    async def _collect_items(
+        self, url: str, batches: asyncio.Queue[list[dict[str, Any]] | None]
+    ) -> None:
+        """Queue raw card items as each source yields them, then ``None``.
+
+        Batches may overlap (the browser fallback re-reads the first page);
+        the consumer dedups them.
+        """
+        try:
+            items, has_more = await self._fetch_offer_cards(url)
+            batches.put_nowait(items)
+            api_count = await self._fetch_api_offers(batches) if has_more else 0
+            if not api_count and (has_more or not items):
+                # Further batches are loaded client-side: fall back to the browser.
+                logger.info(
+                    "PromoQui HTML has %d cards for '%s'%s; using the browser.",
+                    len(items),
+                    self.chain_slug,
+                    " and more to load" if has_more else "",
+                )
+                batches.put_nowait(await self._scrape_with_browser(url))
+        finally:
+            batches.put_nowait(None)
+
+    # ------------------------------------------------------------------
+    # Fetching: plain HTTP first, browser only for pagination
+    # ------------------------------------------------------------------
+
+    async def _fetch_offer_cards(self, url: str) -> tuple[list[dict[str, Any]], bool]:
+        """Fetch the server-rendered offer page and parse its cards.
+
+        Returns the raw card items and whether a "load more" button is present.
+        """
+        client = await self._get_http_client()
+        logger.info("Fetching PromoQui: %s", url)
+        try:
+            resp = await client.get(url)
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            logger.warning("PromoQui HTTP fetch failed for %s.", url, exc_info=True)
+            return [], False
+        return _parse_offer_cards(resp.text, base_url=str(resp.url))
+
+    async def _scrape_with_browser(self, url: str) -> list[dict[str, Any]]:
+        """Render the page, click through every batch and extract all cards.
+
+        JSON calls made by the "load more" button are recorded so the next
+        run can page through the endpoint without a browser.
+        """
+        page = await BROWSER_POOL.acquire()
+        try:
+            logger.info("Navigating to PromoQui: %s", url)
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            await self._accept_cookies(page)
+            await page.wait_for_timeout(2000)
+
+            self._api_urls.clear()
+            page.on("response", self._record_api_response)
+
+            # Load ALL offers by clicking "CARICA ALTRE OFFERTE" up to 50 times
+            await self._load_all_offers(page)
+            items = await self._extract_offers(page)
+        finally:
+            await BROWSER_POOL.release(page)
+        self._save_api_template()
+        return items
+
+    # ------------------------------------------------------------------
+    # Direct JSON endpoint (discovered by a browser run)
+    # ------------------------------------------------------------------
+
+    def _record_api_response(self, response) -> None:
+        request = response.request
+        if request.resource_type not in ("xhr", "fetch"):
+            return
+        if "json" not in (response.headers.get("content-type") or ""):
+            return
+        if "/api/" in response.url or "/_next/data/" in response.url:
+            self._api_urls.append(response.url)
+
+    def _save_api_template(self) -> None:
+        """Persist the recorded endpoint and the query parameter it pages by.
+
+        Two consecutive "load more" calls differ only in the paging
+        parameter, which tells us its name, first value and step.
+        """
+        template = _api_template_from_urls(self._api_urls)
+        if template is None:
+            return
+        templates = _load_api_templates()
+        templates[self.chain_slug] = template
+        try:
+            PROMOQUI_API_PATH.parent.mkdir(parents=True, exist_ok=True)
+            PROMOQUI_API_PATH.write_text(json.dumps(templates, indent=2))
+        except OSError:
+            logger.warning("Could not save PromoQui API template.", exc_info=True)
+            return
+        logger.info("Recorded PromoQui API endpoint for '%s'.", self.chain_slug)
+
+    async def _fetch_api_offers(
+        self, batches: asyncio.Queue[list[dict[str, Any]] | None]
+    ) -> int:
+        """Page through the recorded JSON endpoint concurrently.
+
+        Each window of pages is queued on *batches* as soon as it arrives.
+        A 4xx on any page after the first marks the end of the data.
+        Returns the number of offers queued; 0 when no endpoint is recorded
+        or it failed before anything was queued, in which case the caller
+        falls back to the browser.
+        """
+        template = _load_api_templates().get(self.chain_slug)
+        if not template:
+            return 0
+
+        client = await self._get_http_client()
+        parts = urlsplit(template["url"])
+        query = dict(parse_qsl(parts.query))
+
+        def page_url(n: int) -> str:
+            value = template["start"] + n * template["step"]
+            paged = {**query, template["param"]: str(value)}
+            return urlunsplit(parts._replace(query=urlencode(paged)))
+
+        async def fetch(n: int) -> list[dict[str, Any]]:
+            resp = await client.get(page_url(n), headers={"Accept": "application/json"})
+            if n > 0 and resp.is_client_error:
+                return []
+            resp.raise_for_status()
+            return _offers_from_json(resp.json())
+
+        count = 0
+        try:
+            for first in range(0, _API_MAX_PAGES, _API_PAGE_WINDOW):
+                pages = await asyncio.gather(
+                    *(fetch(n) for n in range(first, first + _API_PAGE_WINDOW))
+                )
+                items = [item for page in pages for item in page]
+                if items:
+                    batches.put_nowait(items)
+                    count += len(items)
+                if not all(pages):
+                    break
+        except (httpx.HTTPError, ValueError):
+            logger.warning(
+                "Recorded PromoQui endpoint failed for '%s'.", self.chain_slug, exc_info=True
+            )
+            if not count:
+                return 0
+
+        logger.info(
+            "PromoQui API: %d offers for '%s'.", count, self.chain_slug
+        )
+        return count
+
     # ------------------------------------------------------------------
     # Cookie consent
     # ------------------------------------------------------------------
 
     async def _accept_cookies(self, page: Page) -> None:
-        """Dismiss cookie consent dialogs (multiple possible providers)."""
+        """Dismiss cookie consent dialogs (multiple possible providers).
+
+        Skipped when the shared context already carries a consent cookie
+        (restored from ``PROMOQUI_STATE_PATH``); after a successful dismissal
+        the context state is saved so later runs skip it too.
+        """
+        cookies = await page.context.cookies()
+        if any(c["name"] in _CONSENT_COOKIES for c in cookies):
+            return
+
         # Try clicking via JS to handle overlays that block Playwright clicks
         dismissed = await page.evaluate("""() => {
             // Common consent button texts
@@ -164,6 +625,7 @@ class PromoQuiScraper(BaseScraper):
         }""")
         if dismissed:
             await page.wait_for_timeout(1000)
+            await BROWSER_POOL.save_state()
             return
 
         # Fallback: Playwright selectors
@@ -180,68 +642,11 @@ class PromoQuiScraper(BaseScraper):
                 if await btn.is_visible(timeout=2000):
                     await btn.click()
                     await page.wait_for_timeout(500)
+                    await BROWSER_POOL.save_state()
                     return
             except (PlaywrightTimeout, Exception):
                 continue
 
-    # ------------------------------------------------------------------
-    # Set location to Monza area
-    # ------------------------------------------------------------------
-
-    async def _set_location(self, page: Page) -> None:
-        """Set PromoQui location to Monza e Brianza for local offers."""
-        # PromoQui has a location search input. We type "Monza" and select.
-        try:
-            # Look for the location/city input field
-            set_ok = await page.evaluate("""() => {
-                // Find the search/location input by placeholder or nearby text
-                const inputs = document.querySelectorAll('input');
-                for (const inp of inputs) {
-                    const ph = (inp.placeholder || '').toLowerCase();
-                    if (ph.includes('cerca') || ph.includes('città') || ph.includes('dove') || ph.includes('localit')) {
-                        inp.value = '';
-                        inp.focus();
-                        return 'found_input';
-                    }
-                }
-                // Check for a "TROVAMI" or location button
-                const btns = document.querySelectorAll('button, a');
-                for (const b of btns) {
-                    const text = b.innerText.trim().toUpperCase();
-                    if (text.includes('MONZA') || text.includes('TROVAMI')) {
-                        return 'found_btn:' + b.innerText.trim();
-                    }
-                }
-                return 'not_found';
-            }""")
-            logger.info("Location search result: %s", set_ok)
-
-            if set_ok == "found_input":
-                # Type Monza in the input
-                inputs = page.locator("input")
-                for i in range(await inputs.count()):
-                    inp = inputs.nth(i)
-                    ph = await inp.get_attribute("placeholder") or ""
-                    if any(k in ph.lower() for k in ("cerca", "città", "dove", "localit")):
-                        await inp.fill("Monza")
-                        await page.wait_for_timeout(1500)
-                        # Click the first suggestion
-                        await page.evaluate("""() => {
-                            const items = document.querySelectorAll('[class*="suggestion"], [class*="autocomplete"] li, [class*="result"] a');
-                            for (const item of items) {
-                                if (item.innerText.toLowerCase().includes('monza')) {
-                                    item.click();
-                                    return true;
-                                }
-                            }
-                            return false;
-                        }""")
-                        await page.wait_for_timeout(2000)
-                        break
-
-        except Exception:
-            logger.warning("Could not set PromoQui location to Monza.")
-
     # ------------------------------------------------------------------
     # Load all offers (scroll + "load more" button) -- up to 50 rounds
     # ------------------------------------------------------------------
@@ -250,73 +655,18 @@ class PromoQuiScraper(BaseScraper):
         """Scroll and click 'load more' repeatedly to get ALL offers.
 
         PromoQui loads ~50 offer cards per batch.  We count only direct offer
-        cards (``OffersList_offer__`` that are NOT sub-elements like image/info).
+        cards (``OffersList_offer__`` that are NOT sub-elements like image/info)
+        and stop once the button is gone and no new cards appeared for three
+        consecutive rounds.
         """
-        # Count only direct offer card divs, excluding sub-elements.
-        CARD_COUNTER_JS = """(() => {
-            const all = document.querySelectorAll('[class*="OffersList_offer__"]');
-            return [...all].filter(el => {
-                const cls = el.className;
-                return !cls.includes('image') && !cls.includes('information') &&
-                       !cls.includes('description') && !cls.includes('title') &&
-                       !cls.includes('offerItem') && !cls.includes('mobilePrice') &&
-                       !cls.includes('infosRetailer') && !cls.includes('buttonIcon');
-            }).length;
-        })()"""
-        consecutive_no_new = 0
-        prev_count = await page.evaluate(CARD_COUNTER_JS)
-        logger.info("Initial offer cards visible: %d", prev_count)
-
-        for i in range(max_loads):
-            # Scroll to bottom to trigger lazy loading
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(1000)
-
-            # Click "CARICA ALTRE OFFERTE" via JavaScript.
-            # PromoQui uses React; Playwright's click() doesn't always trigger
-            # the React event handler, but native JS .click() does.
-            # Match exactly "CARICA ALTRE OFFERTE" to avoid clicking unrelated buttons.
-            clicked = await page.evaluate("""() => {
-                const btns = document.querySelectorAll('button');
-                for (const b of btns) {
-                    const text = b.innerText.trim().toUpperCase();
-                    if (text === 'CARICA ALTRE OFFERTE' && b.offsetParent !== null && b.offsetHeight > 0) {
-                        b.scrollIntoView({behavior: 'instant', block: 'center'});
-                        b.click();
-                        return true;
-                    }
-                }
-                return false;
-            }""")
-            if clicked:
-                await page.wait_for_timeout(3000)
-
-            # Count offer cards now
-            current_count = await page.evaluate(CARD_COUNTER_JS)
-
-            if current_count > prev_count:
-                consecutive_no_new = 0
-                logger.info(
-                    "Load round %d: %d -> %d offer cards.", i + 1, prev_count, current_count
-                )
-            else:
-                consecutive_no_new += 1
-
-            prev_count = current_count
-
-            # Stop if no new content for 3 consecutive rounds
-            if not clicked and consecutive_no_new >= 3:
-                logger.info(
-                    "No more offers to load after %d rounds (%d cards).",
-                    i + 1,
-                    current_count,
-                )
-                break
-
+        # The whole scroll/click/count loop runs in one evaluate call, so a
+        # full load costs a single CDP round-trip instead of ~150.
+        result = await page.evaluate(_LOAD_ALL_JS, max_loads)
         logger.info(
-            "Finished loading: %d rounds, %d offer cards.",
-            min(i + 1, max_loads),
-            prev_count,
+            "Finished loading: %d rounds, %d -> %d offer cards.",
+            result["rounds"],
+            result["initial"],
+            result["count"],
         )
 
     # ------------------------------------------------------------------
@@ -335,91 +685,31 @@ class PromoQuiScraper(BaseScraper):
                 div.*description*                 <- product name
                 div (hidden-sm)                   <- "VOLANTINO XX.XX€ Chain"
                 div (hidden-md-up)                <- "Chain XX.XX€"
+
+        Snapshots the rendered HTML once and parses it in Python with the
+        same parser as the plain-HTTP path, instead of walking ~300 cards
+        over CDP.
+        """
+        html = await page.content()
+        items, _ = _parse_offer_cards(html, base_url=page.url)
+        return items
+
+    def _build_products(
+        self,
+        items: list[dict[str, Any]],
+        seen_products: set[tuple[str, Decimal]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Normalize raw card items (from HTML or the browser) into products.
+
+        Pass the same *seen_products* set across batches to dedup them.
         """
         products: list[dict[str, Any]] = []
+        # Cards repeat (mobile + desktop markup, overlapping batches); key on
+        # the (name, price) tuple itself rather than a formatted string.
+        if seen_products is None:
+            seen_products = set()
 
-        offers_data = await page.evaluate("""() => {
-            // Select individual offer cards (filter out sub-elements).
-            // PromoQui renders each card twice (mobile + desktop).
-            // We deduplicate by name+price inside the JS to avoid doubles.
-            const allOfferEls = document.querySelectorAll('[class*="OffersList_offer__"]');
-            const offerCards = [...allOfferEls].filter(el => {
-                const cls = el.className;
-                return cls.includes('OffersList_offer__') &&
-                       !cls.includes('image') &&
-                       !cls.includes('information') &&
-                       !cls.includes('description') &&
-                       !cls.includes('title') &&
-                       !cls.includes('offerItem') &&
-                       !cls.includes('mobilePrice') &&
-                       !cls.includes('infosRetailer') &&
-                       !cls.includes('buttonIcon');
-            });
-
-            const results = [];
-            const seen = new Set();
-
-            for (const el of offerCards) {
-                const imgEl = el.querySelector('img');
-                const descEl = el.querySelector('[class*="description"]');
-                const titleEl = el.querySelector('[class*="title"]');
-
-                let name = '';
-                if (descEl) name = descEl.innerText.trim();
-                if (!name && titleEl) name = titleEl.innerText.trim();
-                if (!name && imgEl) name = (imgEl.alt || imgEl.title || '').trim();
-                if (!name || name.length < 2) continue;
-
-                const text = el.innerText || '';
-
-                // Price: XX.XX€ or XX,XX€ (€ may be on next line)
-                let offerPrice = null;
-                let originalPrice = null;
-                const priceMatches = text.match(/(\\d+[,.]\\d{2})\\s*€/g);
-                if (priceMatches && priceMatches.length > 0) {
-                    offerPrice = priceMatches[0].replace('€', '').trim();
-                    if (priceMatches.length > 1) {
-                        originalPrice = priceMatches[1].replace('€', '').trim();
-                    }
-                }
-
-                // JS-level dedup: same name+price = same product (mobile/desktop)
-                const dedupKey = name.toLowerCase().substring(0, 60) + '|' + (offerPrice || '');
-                if (seen.has(dedupKey)) continue;
-                seen.add(dedupKey);
-
-                let discount = null;
-                const discountMatch = text.match(/-\\s*(\\d+)\\s*%/);
-                if (discountMatch) discount = discountMatch[1];
-
-                const imgSrc = imgEl ? (imgEl.src || imgEl.getAttribute('data-src')) : null;
-
-                let quantity = null;
-                const qtyMatch = text.match(/(\\d+(?:[,.]\\d+)?\\s*(?:g|kg|ml|l|cl|pz|pezzi|conf)\\b)/i);
-                if (qtyMatch) quantity = qtyMatch[1];
-
-                const linkEl = el.querySelector('a[href*="/volantino/"]');
-                const href = linkEl ? linkEl.href : null;
-
-                results.push({
-                    name: name,
-                    brand: null,
-                    category: null,
-                    offer_price: offerPrice,
-                    original_price: originalPrice,
-                    discount_pct: discount,
-                    quantity: quantity,
-                    image_url: imgSrc,
-                    raw_text: text.substring(0, 500),
-                    source_link: href,
-                });
-            }
-            return results;
-        }""")
-
-        seen_products: set[str] = set()
-
-        for item in offers_data:
+        for item in items:
             name = item.get("name", "").strip()
             if not name or len(name) < 2:
                 continue
@@ -429,8 +719,7 @@ class PromoQuiScraper(BaseScraper):
             if offer_price is None:
                 continue
 
-            # Deduplicate by name + price
-            dedup_key = f"{name.lower()}|{offer_price}"
+            dedup_key = (name.lower(), offer_price)
             if dedup_key in seen_products:
                 continue
             seen_products.add(dedup_key)
@@ -451,9 +740,9 @@ class PromoQuiScraper(BaseScraper):
                 "name": name,
                 "brand": (item.get("brand") or "").strip() or None,
                 "category": (item.get("category") or "").strip() or None,
-                "original_price": str(original_price) if original_price else None,
-                "offer_price": str(offer_price),
-                "discount_pct": str(discount_pct) if discount_pct else None,
+                "original_price": original_price or None,
+                "offer_price": offer_price,
+                "discount_pct": discount_pct or None,
                 "discount_type": "percentage" if discount_pct else None,
                 "quantity": item.get("quantity"),
                 "price_per_unit": None,
@@ -468,42 +757,55 @@ class PromoQuiScraper(BaseScraper):
     # Database persistence
     # ------------------------------------------------------------------
 
-    async def _persist_offers(self, flyer_data: dict[str, Any]) -> None:
-        """Create Flyer and save products to DB.
+    async def _persist_offers(
+        self,
+        flyer_data: dict[str, Any],
+        batches: asyncio.Queue[list[dict[str, Any]] | None],
+    ) -> None:
+        """Create Flyer and save products to DB as batches arrive.
+
+        Consumes raw card items from *batches* until ``None``, appending the
+        deduplicated products to ``flyer_data["products"]`` and writing them
+        in chunks of ``_PERSIST_BATCH``.  The flyer is created with the first
+        chunk and committed once at the end.
 
         Uses date-based deduplication: same source_url + overlapping date
         range won't create a duplicate flyer. But a new week's scraping
         creates a new flyer with new offers, building price history.
         """
-        from app.models.offer import Offer
         from sqlalchemy import select, and_
 
         store_id = flyer_data.get("store_id")
         valid_from = flyer_data.get("valid_from") or date.today()
         valid_to = flyer_data.get("valid_to") or date.today()
 
+        seen_products: set[tuple[str, Decimal]] = set()
+        saved = 0
+        flyer: Flyer | None = None
         async with async_session() as session:
-            # Find the chain
-            stmt = select(Chain).where(Chain.slug == self.chain_slug)
-            result = await session.execute(stmt)
-            chain = result.scalar_one_or_none()
+            # Chain and any existing flyer for the same source and dates
+            # (date-based dedup) come back from a single outer-joined query,
+            # issued while the first page is still being fetched.
+            result = await session.execute(
+                select(Chain, Flyer)
+                .outerjoin(
+                    Flyer,
+                    and_(
+                        Flyer.chain_id == Chain.id,
+                        Flyer.source_url == flyer_data["source_url"],
+                        Flyer.valid_from == valid_from,
+                        Flyer.valid_to == valid_to,
+                    ),
+                )
+                .where(Chain.slug == self.chain_slug)
+                .limit(1)
+            )
+            row = result.first()
 
+            chain, existing = row if row is not None else (None, None)
             if chain is None:
                 logger.error("Chain '%s' not found in DB.", self.chain_slug)
-                return
-
-            # Date-based dedup: check for existing flyer with same source and
-            # overlapping validity dates
-            stmt_existing = select(Flyer).where(
-                and_(
-                    Flyer.source_url == flyer_data["source_url"],
-                    Flyer.chain_id == chain.id,
-                    Flyer.valid_from == valid_from,
-                    Flyer.valid_to == valid_to,
-                )
-            )
-            existing = (await session.execute(stmt_existing)).scalar_one_or_none()
-            if existing:
+            elif existing:
                 logger.info(
                     "PromoQui flyer already exists for '%s' (%s to %s, id=%s), skipping.",
                     self.chain_slug,
@@ -511,87 +813,332 @@ class PromoQuiScraper(BaseScraper):
                     valid_to,
                     existing.id,
                 )
-                return
-
-            flyer = Flyer(
-                chain_id=chain.id,
-                store_id=store_id,
-                title=flyer_data["title"],
-                valid_from=valid_from,
-                valid_to=valid_to,
-                source_url=flyer_data["source_url"],
-                pages_count=1,
-                status="processing",
-            )
-            session.add(flyer)
-            await session.commit()
-            await session.refresh(flyer)
-
-            flyer_id = flyer.id
-            chain_id = chain.id
 
-        # Save products
-        saved = 0
-        async with async_session() as session:
-            for prod_data in flyer_data.get("products", []):
-                try:
-                    name = (prod_data.get("name") or "").strip()
-                    if not name:
-                        continue
-
-                    offer_price = self.normalize_price(prod_data.get("offer_price"))
-                    if offer_price is None:
-                        continue
-
-                    brand = (prod_data.get("brand") or "").strip() or None
-
-                    # Find or create product (fuzzy dedup via ProductMatcher)
-                    product = await self._find_or_create_product(
-                        {
-                            "name": name,
-                            "brand": brand,
-                            "category": prod_data.get("category"),
-                            "unit": prod_data.get("quantity"),
-                            "image_url": prod_data.get("image_url"),
-                            "source": "promoqui",
-                        },
-                        session=session,
-                    )
-
-                    discount_pct = self.normalize_discount_pct(prod_data.get("discount_pct"))
-                    original_price = self.normalize_price(prod_data.get("original_price"))
-
-                    offer = Offer(
-                        product_id=product.id,
-                        flyer_id=flyer_id,
-                        chain_id=chain_id,
-                        store_id=store_id,
-                        original_price=original_price,
-                        offer_price=offer_price,
-                        discount_pct=discount_pct,
-                        discount_type=prod_data.get("discount_type"),
-                        quantity=prod_data.get("quantity"),
-                        price_per_unit=None,
-                        valid_from=flyer_data.get("valid_from"),
-                        valid_to=flyer_data.get("valid_to"),
-                        raw_text=prod_data.get("raw_text", "")[:500],
-                        confidence=Decimal(str(prod_data.get("confidence", 0.8))),
+            # Exact-name hits and the fuzzy candidate pool are shared across
+            # chunks; the pool grows as products are created so later
+            # near-duplicates still match them.
+            matcher = ProductMatcher()
+            known: dict[str, Product] = {}
+            pool: list[Product] = []
+            now = datetime.now(timezone.utc)
+
+            while (items := await batches.get()) is not None:
+                products = self._build_products(items, seen_products)
+                flyer_data["products"].extend(products)
+                if chain is None or existing:
+                    continue  # keep draining so the producer can finish
+
+                for start in range(0, len(products), _PERSIST_BATCH):
+                    if flyer is None:
+                        flyer = Flyer(
+                            chain_id=chain.id,
+                            store_id=store_id,
+                            title=flyer_data["title"],
+                            valid_from=valid_from,
+                            valid_to=valid_to,
+                            source_url=flyer_data["source_url"],
+                            pages_count=1,
+                            status="processing",
+                        )
+                        session.add(flyer)
+                        await session.flush()
+                    saved += await self._persist_batch(
+                        session,
+                        flyer_data,
+                        products[start:start + _PERSIST_BATCH],
+                        flyer_id=flyer.id,
+                        chain_id=chain.id,
+                        matcher=matcher,
+                        known=known,
+                        pool=pool,
+                        now=now,
                     )
-                    session.add(offer)
-                    saved += 1
-
-                except Exception:
-                    logger.exception("Failed to save product: %s", prod_data.get("name"))
-
-            flyer = await session.get(Flyer, flyer_id)
-            if flyer:
-                flyer.status = "processed"
 
+            if flyer is None:
+                return
+            flyer.status = "processed"
             await session.commit()
 
         logger.info(
             "PromoQui: persisted %d products for '%s' (flyer %s).",
             saved,
             self.chain_slug,
-            flyer_id,
+            flyer.id,
+        )
+
+    async def _persist_batch(
+        self,
+        session,
+        flyer_data: dict[str, Any],
+        products: list[dict[str, Any]],
+        *,
+        flyer_id: uuid.UUID,
+        chain_id: uuid.UUID,
+        matcher: ProductMatcher,
+        known: dict[str, Product],
+        pool: list[Product],
+        now: datetime,
+    ) -> int:
+        """Match or create *products* and COPY their offers.
+
+        Exact-name hits come from one prefetch; the rest are fuzzy-matched
+        in memory against one candidate pool fetched for the chunk.  Offers
+        are written with one COPY instead of an INSERT per product.
+        """
+        from sqlalchemy import select
+
+        store_id = flyer_data.get("store_id")
+        names = {
+            (p.get("name") or "").strip() for p in products
+        } - {""} - known.keys()
+        if names:
+            result = await session.execute(
+                select(Product).where(Product.name.in_(names))
+            )
+            for product in result.scalars():
+                known.setdefault(product.name, product)
+
+        pooled = {p.id for p in pool}
+        pool.extend(
+            p for p in await matcher.prefetch_candidates(
+                [
+                    ((p.get("name") or "").strip(), (p.get("brand") or "").strip() or None)
+                    for p in products
+                    if (p.get("name") or "").strip() not in known
+                ],
+                session=session,
+            )
+            if p.id not in pooled
         )
+
+        offer_rows: list[dict[str, Any]] = []
+        for prod_data in products:
+            try:
+                name = (prod_data.get("name") or "").strip()
+                if not name:
+                    continue
+
+                offer_price = _as_decimal(
+                    prod_data.get("offer_price"), self.normalize_price
+                )
+                if offer_price is None:
+                    continue
+
+                brand = (prod_data.get("brand") or "").strip() or None
+                raw_product = {
+                    "name": name,
+                    "brand": brand,
+                    "category": prod_data.get("category"),
+                    "unit": prod_data.get("quantity"),
+                    "image_url": prod_data.get("image_url"),
+                    "source": "promoqui",
+                }
+
+                product = known.get(name)
+                if product is None:
+                    if matcher.search_tokens(name, brand):
+                        product = matcher.match_in_pool(
+                            name, brand, pool, category=raw_product["category"]
+                        )
+                    elif matcher.is_garbage_name(name):
+                        continue
+                    else:
+                        # No search tokens: full fuzzy scan. Read-only, unlike
+                        # create_or_match_product, which would commit (or roll
+                        # back) this chunk's pending rows mid-batch.
+                        product = await matcher.find_matching_product(
+                            name, brand, category=raw_product["category"], session=session
+                        )
+                    if product is None:
+                        product = matcher.new_product(raw_product, now)
+                        session.add(product)
+                        pool.append(product)
+                    known[name] = product
+                ProductMatcher._enrich_product(product, raw_product, now)
+
+                offer_rows.append({
+                    "product_id": product.id,
+                    "flyer_id": flyer_id,
+                    "chain_id": chain_id,
+                    "store_id": store_id,
+                    "original_price": _as_decimal(
+                        prod_data.get("original_price"), self.normalize_price
+                    ),
+                    "offer_price": offer_price,
+                    "discount_pct": _as_decimal(
+                        prod_data.get("discount_pct"), self.normalize_discount_pct
+                    ),
+                    "discount_type": prod_data.get("discount_type"),
+                    "quantity": prod_data.get("quantity"),
+                    "valid_from": flyer_data.get("valid_from"),
+                    "valid_to": flyer_data.get("valid_to"),
+                    "raw_text": prod_data.get("raw_text", ""),
+                    "confidence": Decimal(str(prod_data.get("confidence", 0.8))),
+                })
+
+            except Exception:
+                logger.exception("Failed to save product: %s", prod_data.get("name"))
+
+        # COPY runs on the raw connection, so pending products must be
+        # flushed first for the offers' foreign keys to resolve.
+        await session.flush()
+        return await copy_offers(session, offer_rows)
+
+
+def _as_decimal(value: Any, parse) -> Decimal | None:
+    """Return *value* as is when already a ``Decimal`` (as built by
+    ``_build_products``), otherwise run it through *parse*."""
+    if isinstance(value, Decimal):
+        return value
+    return parse(value)
+
+
+def _is_offer_card(tag) -> bool:
+    cls = " ".join(tag.get("class") or ())
+    return _CARD_CLASS_PREFIX in cls and not any(
+        frag in cls for frag in _CARD_CLASS_EXCLUDE
+    )
+
+
+def _card_item(
+    name: str, text: str, image_url: str | None, link: str | None
+) -> dict[str, Any]:
+    """Build a raw card item from a card's name and visible text."""
+    prices = _PRICE_RE.findall(text)
+    discount = _DISCOUNT_RE.search(text)
+    qty = _QTY_RE.search(text)
+    return {
+        "name": name,
+        "brand": None,
+        "category": None,
+        "offer_price": prices[0] if prices else None,
+        "original_price": prices[1] if len(prices) > 1 else None,
+        "discount_pct": discount.group(1) if discount else None,
+        "quantity": qty.group(1) if qty else None,
+        "image_url": image_url,
+        "raw_text": " ".join(text.split())[:_RAW_TEXT_MAX],
+        "source_link": link,
+    }
+
+
+def _parse_offer_cards(
+    html: str, base_url: str = PromoQuiScraper.base_url
+) -> tuple[list[dict[str, Any]], bool]:
+    """Parse offer cards from server-rendered or browser-snapshotted HTML.
+
+    Relative image/link URLs are resolved against *base_url*.  Returns
+    ``(items, has_more)`` where *has_more* is true when the page shows the
+    "CARICA ALTRE OFFERTE" button (remaining batches need JS).
+    """
+    soup = BeautifulSoup(html, "lxml")
+    items: list[dict[str, Any]] = []
+
+    for card in soup.find_all(_is_offer_card):
+        img = card.find("img")
+        desc = card.find(class_=lambda c: c is not None and "description" in c)
+        title = card.find(class_=lambda c: c is not None and "title" in c)
+
+        name = ""
+        if desc:
+            name = desc.get_text(" ", strip=True)
+        if not name and title:
+            name = title.get_text(" ", strip=True)
+        if not name and img:
+            name = (img.get("alt") or img.get("title") or "").strip()
+        if len(name) < 2:
+            continue
+
+        link = card.find("a", href=lambda h: h is not None and "/volantino/" in h)
+        image_url = (img.get("src") or img.get("data-src")) if img else None
+        items.append(_card_item(
+            name,
+            card.get_text("\n", strip=True),
+            urljoin(base_url, image_url) if image_url else None,
+            urljoin(base_url, link["href"]) if link else None,
+        ))
+
+    has_more = any(
+        btn.get_text(strip=True).upper() == _LOAD_MORE_TEXT
+        for btn in soup.find_all("button")
+    )
+    return items, has_more
+
+
+def _load_api_templates() -> dict[str, dict[str, Any]]:
+    if not PROMOQUI_API_PATH.exists():
+        return {}
+    try:
+        return json.loads(PROMOQUI_API_PATH.read_text())
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable %s.", PROMOQUI_API_PATH)
+        return {}
+
+
+def _api_template_from_urls(urls: list[str]) -> dict[str, Any] | None:
+    """Derive ``{url, param, start, step}`` from two consecutive page URLs."""
+    for first, second in zip(urls, urls[1:]):
+        a, b = urlsplit(first), urlsplit(second)
+        if a.path != b.path:
+            continue
+        qa, qb = dict(parse_qsl(a.query)), dict(parse_qsl(b.query))
+        changed = [k for k in qa if k in qb and qa[k] != qb[k]]
+        if len(changed) != 1:
+            continue
+        param = changed[0]
+        try:
+            start, step = int(qa[param]), int(qb[param]) - int(qa[param])
+        except ValueError:
+            continue
+        if step > 0:
+            return {"url": first, "param": param, "start": start, "step": step}
+    return None
+
+
+def _first_value(obj: dict[str, Any], keys: tuple[str, ...]) -> str | None:
+    for key in keys:
+        value = obj.get(key)
+        if isinstance(value, dict):
+            value = value.get("value") or value.get("url") or value.get("amount")
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def _offers_from_json(payload: Any) -> list[dict[str, Any]]:
+    """Map the endpoint's offer objects to card items.
+
+    The offers are the largest list of objects in the payload that carry a
+    price; field names are matched against a few common spellings.
+    """
+    best: list[dict[str, Any]] = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            objs = [x for x in node if isinstance(x, dict)]
+            if len(objs) > len(best) and any(
+                _first_value(o, _JSON_PRICE_KEYS) for o in objs
+            ):
+                best = objs
+            stack.extend(node)
+
+    items: list[dict[str, Any]] = []
+    for obj in best:
+        name = (_first_value(obj, _JSON_NAME_KEYS) or "").strip()
+        qty = _QTY_RE.search(name)
+        discount = _first_value(obj, _JSON_DISCOUNT_KEYS)
+        items.append({
+            "name": name,
+            "brand": obj.get("brand") if isinstance(obj.get("brand"), str) else None,
+            "category": None,
+            "offer_price": _first_value(obj, _JSON_PRICE_KEYS),
+            "original_price": _first_value(obj, _JSON_ORIGINAL_KEYS),
+            "discount_pct": discount.lstrip("-").rstrip("%") if discount else None,
+            "quantity": qty.group(1) if qty else None,
+            "image_url": _first_value(obj, _JSON_IMAGE_KEYS),
+            "raw_text": name[:_RAW_TEXT_MAX],
+            "source_link": None,
+        })
+    return items
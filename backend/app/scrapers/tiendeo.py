@@ -31,8 +31,8 @@ from bs4 import BeautifulSoup
 from app.database import async_session
 from app.models.chain import Chain
 from app.models.flyer import Flyer
-from app.models.offer import Offer
 from app.scrapers.base import BaseScraper
+from app.scrapers.bulk import copy_offers
 from app.services.product_matcher import ProductMatcher
 
 logger = logging.getLogger(__name__)
@@ -386,7 +386,7 @@ class TiendeoScraper(BaseScraper):
             chain_id = chain.id
 
         # Save products using ProductMatcher for fuzzy dedup
-        saved = 0
+        offers: list[dict[str, Any]] = []
         async with async_session() as session:
             for prod_data in flyer_data.get("products", []):
                 try:
@@ -429,32 +429,37 @@ class TiendeoScraper(BaseScraper):
                     )
                     ppu_computed = ppu is not None
 
-                    offer = Offer(
-                        product_id=product.id,
-                        flyer_id=flyer_id,
-                        chain_id=chain_id,
-                        store_id=store_id,
-                        original_price=original_price,
-                        offer_price=offer_price,
-                        discount_pct=discount_pct,
-                        discount_type=prod_data.get("discount_type"),
-                        quantity=quantity_str,
-                        price_per_unit=ppu,
-                        unit_reference=unit_ref,
-                        ppu_computed=ppu_computed,
-                        valid_from=valid_from,
-                        valid_to=valid_to,
-                        raw_text=prod_data.get("raw_text", "")[:500],
-                        confidence=Decimal(str(prod_data.get("confidence", 0.95))),
+                    offers.append(
+                        {
+                            "product_id": product.id,
+                            "flyer_id": flyer_id,
+                            "chain_id": chain_id,
+                            "store_id": store_id,
+                            "original_price": original_price,
+                            "offer_price": offer_price,
+                            "discount_pct": discount_pct,
+                            "discount_type": prod_data.get("discount_type"),
+                            "quantity": quantity_str,
+                            "price_per_unit": ppu,
+                            "unit_reference": unit_ref,
+                            "ppu_computed": ppu_computed,
+                            "valid_from": valid_from,
+                            "valid_to": valid_to,
+                            "raw_text": prod_data.get("raw_text", "")[:500],
+                            "confidence": Decimal(
+                                str(prod_data.get("confidence", 0.95))
+                            ),
+                        }
                     )
-                    session.add(offer)
-                    saved += 1
 
                 except Exception:
                     logger.exception(
                         "Failed to save Tiendeo product: %s", prod_data.get("name")
                     )
 
+            # One COPY for the whole flyer instead of an INSERT per product.
+            saved = await copy_offers(session, offers)
+
             flyer = await session.get(Flyer, flyer_id)
             if flyer:
                 flyer.status = "processed"
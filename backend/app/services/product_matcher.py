@@ -31,6 +31,7 @@ def is_valid_ean(code: str | None) -> bool:
 
 MATCH_THRESHOLD = 85  # similarity >= 85 % ⇒ treat as the same product
 BRAND_MATCH_THRESHOLD = 85  # threshold when brands match exactly
+_GARBAGE_NAMES = frozenset({"-", ".", "N/A", "n/a", "--", "...", ""})
 
 # ---------------------------------------------------------------------------
 # Italian plural → singular stemming map (grocery nouns)
@@ -1056,6 +1057,15 @@ class ProductMatcher:
     # Database look-ups
     # ------------------------------------------------------------------
 
+    @classmethod
+    def search_tokens(cls, name: str, brand: str | None = None) -> list[str]:
+        """Return up to three significant tokens of *name* for candidate
+        pre-filtering (private label, brand and units stripped)."""
+        cleaned = cls._strip_units(cls._strip_brand(
+            cls._strip_private_label(name), brand))
+        tokens = cls.normalize_text(cleaned).split()
+        return [t for t in tokens if len(t) > 3][:3]
+
     async def find_matching_product(
         self,
         name: str,
@@ -1087,10 +1097,7 @@ class ProductMatcher:
 
             # Pre-filter: use significant tokens from the name (after
             # stripping private labels, brand and units) to narrow candidates via SQL ILIKE.
-            cleaned = self._strip_units(self._strip_brand(
-                self._strip_private_label(name), brand))
-            tokens = self.normalize_text(cleaned).split()
-            significant = [t for t in tokens if len(t) > 3][:3]
+            significant = self.search_tokens(name, brand)
 
             # Fetch candidates – restrict to same brand when available
             if canonical_brand:
@@ -1122,61 +1129,130 @@ class ProductMatcher:
             if not candidates:
                 return None
 
-            best_score: float = 0.0
-            best_product: Product | None = None
+            return self._best_match(name, brand, canonical_brand, category, candidates)
+        finally:
+            if close_session:
+                await session.close()
 
-            for product in candidates:
-                score = self.fuzzy_match(
-                    name, product.name,
-                    brand1=brand, brand2=product.brand,
-                )
+    def _best_match(
+        self,
+        name: str,
+        brand: str | None,
+        canonical_brand: str | None,
+        category: str | None,
+        candidates: list[Product],
+    ) -> Optional[Product]:
+        """Score *candidates* against *name* and return the best one if it
+        clears the match threshold (see :meth:`find_matching_product`)."""
+        best_score: float = 0.0
+        best_product: Product | None = None
+
+        for product in candidates:
+            score = self.fuzzy_match(
+                name, product.name,
+                brand1=brand, brand2=product.brand,
+            )
 
-                # Category guard: if both have a category and they differ,
-                # cap score to prevent cross-category false merges
-                if (
-                    category
-                    and product.category
-                    and category != product.category
-                    and category != "Supermercato"
-                    and product.category != "Supermercato"
-                ):
-                    score = min(score, 70.0)
+            # Category guard: if both have a category and they differ,
+            # cap score to prevent cross-category false merges
+            if (
+                category
+                and product.category
+                and category != product.category
+                and category != "Supermercato"
+                and product.category != "Supermercato"
+            ):
+                score = min(score, 70.0)
+
+            # Give a bonus when brands match exactly
+            if canonical_brand and product.brand == canonical_brand:
+                score = min(score + 5, 100.0)
+
+            if score > best_score:
+                best_score = score
+                best_product = product
+
+        # Use a lower threshold when brands match (the brand-aware
+        # token_set_ratio already ensures quality)
+        threshold = MATCH_THRESHOLD
+        if (
+            canonical_brand
+            and best_product is not None
+            and best_product.brand == canonical_brand
+        ):
+            threshold = BRAND_MATCH_THRESHOLD
+
+        if best_score >= threshold and best_product is not None:
+            logger.info(
+                "Matched '%s' -> '%s' (score=%.1f, threshold=%d)",
+                name,
+                best_product.name,
+                best_score,
+                threshold,
+            )
+            return best_product
 
-                # Give a bonus when brands match exactly
-                if canonical_brand and product.brand == canonical_brand:
-                    score = min(score + 5, 100.0)
+        logger.debug(
+            "No match for '%s' (best score=%.1f)", name, best_score
+        )
+        return None
 
-                if score > best_score:
-                    best_score = score
-                    best_product = product
+    # ------------------------------------------------------------------
+    # Batch matching against a prefetched pool
+    # ------------------------------------------------------------------
 
-            # Use a lower threshold when brands match (the brand-aware
-            # token_set_ratio already ensures quality)
-            threshold = MATCH_THRESHOLD
-            if (
-                canonical_brand
-                and best_product is not None
-                and best_product.brand == canonical_brand
-            ):
-                threshold = BRAND_MATCH_THRESHOLD
+    async def prefetch_candidates(
+        self,
+        names: list[tuple[str, str | None]],
+        *,
+        session: AsyncSession,
+    ) -> list[Product]:
+        """Load every product any of *names* could match, in one query.
+
+        *names* are ``(name, brand)`` pairs.  The union of their
+        :meth:`search_tokens` becomes a single case-insensitive regex,
+        replacing the one or two ILIKE queries per name issued by
+        :meth:`find_matching_product`.
+        """
+        tokens = sorted({
+            tok for name, brand in names for tok in self.search_tokens(name, brand)
+        })
+        if not tokens:
+            return []
+        pattern = "|".join(re.escape(tok) for tok in tokens)
+        result = await session.execute(
+            select(Product).where(Product.name.op("~*")(pattern))
+        )
+        return list(result.scalars().all())
 
-            if best_score >= threshold and best_product is not None:
-                logger.info(
-                    "Matched '%s' -> '%s' (score=%.1f, threshold=%d)",
-                    name,
-                    best_product.name,
-                    best_score,
-                    threshold,
-                )
-                return best_product
+    def match_in_pool(
+        self,
+        name: str,
+        brand: str | None,
+        pool: list[Product],
+        *,
+        category: str | None = None,
+    ) -> Optional[Product]:
+        """In-memory :meth:`find_matching_product` over a prefetched *pool*.
 
-            logger.debug(
-                "No match for '%s' (best score=%.1f)", name, best_score
-            )
+        Same brand-first, token-fallback candidate selection, with substring
+        tests standing in for ILIKE.  Only equivalent for names that have
+        :meth:`search_tokens`; the SQL path scans every product otherwise.
+        """
+        canonical_brand = self.normalize_brand(brand)
+        significant = self.search_tokens(name, brand)
+        with_token = [
+            p for p in pool
+            if any(tok in p.name.lower() for tok in significant)
+        ]
+        candidates: list[Product] = []
+        if canonical_brand:
+            candidates = [p for p in with_token if p.brand == canonical_brand]
+        if not candidates:
+            candidates = with_token
+        if not candidates:
             return None
-        finally:
-            if close_session:
-                await session.close()
+        return self._best_match(name, brand, canonical_brand, category, candidates)
 
     async def find_receipt_match(
         self,
@@ -1326,6 +1402,34 @@ class ProductMatcher:
     # Create-or-match entry point
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def is_garbage_name(name: str) -> bool:
+        """True for placeholder names (``-``, ``N/A``, ...) never worth a product."""
+        return len(name) < 2 or name in _GARBAGE_NAMES
+
+    def new_product(self, raw_data: dict, now: datetime) -> Product:
+        """Build (but do not add) a :class:`Product` from *raw_data*, with
+        canonical brand and a keyword-derived category when none is given."""
+        name: str = raw_data.get("name", "").strip()
+        canonical_brand = self.normalize_brand(raw_data.get("brand"))
+        category = raw_data.get("category")
+        if not category or category == "Supermercato":
+            category = self.categorize_by_keywords(name, canonical_brand)
+        if not category:
+            category = "Altro"
+        return Product(
+            id=uuid.uuid4(),
+            name=name,
+            brand=canonical_brand,
+            category=category,
+            subcategory=raw_data.get("subcategory"),
+            unit=raw_data.get("unit"),
+            barcode=raw_data.get("barcode"),
+            image_url=raw_data.get("image_url"),
+            source=raw_data.get("source"),
+            last_seen_at=now,
+        )
+
     async def create_or_match_product(
         self,
         raw_data: dict,
@@ -1345,8 +1449,7 @@ class ProductMatcher:
             raise ValueError("Product name is required in raw_data")
 
         # Reject garbage product names
-        _GARBAGE_NAMES = {"-", ".", "N/A", "n/a", "--", "...", ""}
-        if len(name) < 2 or name in _GARBAGE_NAMES:
+        if self.is_garbage_name(name):
             raise ValueError(f"Product name is garbage: '{name}'")
 
         close_session = False
@@ -1356,7 +1459,6 @@ class ProductMatcher:
 
         try:
             now = datetime.now(timezone.utc)
-            source = raw_data.get("source")
 
             # --- 1. Exact barcode look-up (fastest) ---
             barcode = raw_data.get("barcode")
@@ -1402,24 +1504,7 @@ class ProductMatcher:
                     return matched
 
             # --- 3. Create new product ---
-            canonical_brand = self.normalize_brand(brand)
-            category = raw_data.get("category")
-            if not category or category == "Supermercato":
-                category = self.categorize_by_keywords(name, canonical_brand)
-            if not category:
-                category = "Altro"
-            product = Product(
-                id=uuid.uuid4(),
-                name=name.strip(),
-                brand=canonical_brand,
-                category=category,
-                subcategory=raw_data.get("subcategory"),
-                unit=raw_data.get("unit"),
-                barcode=barcode,
-                image_url=raw_data.get("image_url"),
-                source=source,
-                last_seen_at=now,
-            )
+            product = self.new_product({**raw_data, "barcode": barcode}, now)
             session.add(product)
             await session.commit()
             await session.refresh(product)
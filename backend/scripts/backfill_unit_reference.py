@@ -33,6 +33,10 @@ PZ_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# Offer ids per UPDATE ... WHERE id IN (...), well below the driver's
+# bind-parameter limit.
+UPDATE_CHUNK = 5000
+
 
 def infer_unit_reference(
     raw_text: str | None,
@@ -88,7 +92,8 @@ async def main():
         rows = result.all()
         logger.info("Found %d offers without unit_reference.", len(rows))
 
-        updated = 0
+        # Bucket offer ids by inferred unit, then one UPDATE per bucket chunk
+        buckets: dict[str, list] = {"kg": [], "l": [], "pz": []}
         for offer_id, raw_text, quantity, price_per_unit, product_unit in rows:
             unit_ref = infer_unit_reference(
                 raw_text=raw_text,
@@ -97,15 +102,18 @@ async def main():
                 has_price_per_unit=price_per_unit is not None,
             )
             if unit_ref:
-                if not dry_run:
+                buckets[unit_ref].append(offer_id)
+        updated = sum(len(ids) for ids in buckets.values())
+
+        if not dry_run:
+            for unit_ref, ids in buckets.items():
+                for start in range(0, len(ids), UPDATE_CHUNK):
                     await session.execute(
                         update(Offer)
-                        .where(Offer.id == offer_id)
+                        .where(Offer.id.in_(ids[start:start + UPDATE_CHUNK]))
                         .values(unit_reference=unit_ref)
+                        .execution_options(synchronize_session=False)
                     )
-                updated += 1
-
-        if not dry_run:
             await session.commit()
 
         logger.info(
@@ -15,12 +15,13 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import logging
 import re
-import time
+from dataclasses import dataclass
+from functools import lru_cache
 
-from sqlalchemy import select, update
+import orjson
+from sqlalchemy import case, func, select, update
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -28,7 +29,7 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 # Valid categories (closed list)
 # ---------------------------------------------------------------------------
-VALID_CATEGORIES = {
+VALID_CATEGORIES = frozenset({
     "Latticini",
     "Frutta e Verdura",
     "Bevande",
@@ -51,7 +52,7 @@ VALID_CATEGORIES = {
     "Gastronomia",
     "Benessere e Intolleranze",
     "Altro",
-}
+})
 
 _CATEGORIES_STR = ", ".join(f'"{c}"' for c in sorted(VALID_CATEGORIES))
 
@@ -79,6 +80,16 @@ Se non riesci a determinarlo, usa null.
 Restituisci SOLO un JSON array valido. Nessun commento, nessun markdown fence."""
 
 
+@dataclass(frozen=True, slots=True)
+class _PayloadItem:
+    """One product sent for classification; orjson encodes slotted
+    dataclasses natively, without building an intermediate dict."""
+
+    id: int
+    name: str
+    brand: str
+
+
 # ---------------------------------------------------------------------------
 # AI Provider abstraction
 # ---------------------------------------------------------------------------
@@ -126,7 +137,20 @@ class GeminiProvider(AIProvider):
 
     async def classify(self, payload_json: str) -> str:
         response = await self.model.generate_content_async(payload_json)
-        return response.text.strip()
+        return response.text
+
+
+@lru_cache(maxsize=4)
+def _get_provider(provider_name: str, api_key: str, model: str) -> AIProvider:
+    """Build the provider once per (provider, key, model).
+
+    When ``enrich_products`` is called repeatedly from a long-lived process
+    (same event loop), the SDK client and its warm HTTP connections are
+    reused instead of being set up on every run.
+    """
+    if provider_name == "claude":
+        return ClaudeProvider(api_key, model)
+    return GeminiProvider(api_key, model)
 
 
 # ---------------------------------------------------------------------------
@@ -136,34 +160,79 @@ class GeminiProvider(AIProvider):
 def _parse_json_response(raw: str) -> list[dict]:
     """Parse JSON from AI response, stripping markdown fences if needed."""
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
-        cleaned = raw
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Whitespace is only stripped on this slow path; orjson skips it.
+        cleaned = raw.strip()
         if cleaned.startswith("```"):
             cleaned = cleaned.split("\n", 1)[-1]
         if cleaned.endswith("```"):
             cleaned = cleaned.rsplit("```", 1)[0]
         try:
-            return json.loads(cleaned.strip())
-        except json.JSONDecodeError:
+            return orjson.loads(cleaned.strip())
+        except orjson.JSONDecodeError:
             logger.error("Could not parse AI response:\n%s", raw[:2000])
             return []
 
 
+# Each pattern this replaced was \b(word|word...)\b, i.e. "some whole \w+ run
+# equals one of the words" -- exactly a set lookup over the \w+ tokens.
+_UNIT_TOKEN_RE = re.compile(r"\w+")
+_KG_TOKENS = frozenset({"kg", "kilo", "gramm", "g"})
+_L_TOKENS = frozenset({"l", "lt", "litro", "litri", "ml"})
+_PZ_TOKENS = frozenset({"pz", "pezzo", "pezzi", "unita", "unità"})
+
+
 def _infer_unit_reference_from_unit(unit: str | None) -> str | None:
     """Infer unit_reference (kg/l/pz) from a product's unit string."""
     if not unit:
         return None
-    u = unit.lower().strip()
-    if re.search(r"\b(kg|kilo|gramm|g)\b", u):
+    tokens = set(_UNIT_TOKEN_RE.findall(unit.lower()))
+    if tokens & _KG_TOKENS:
         return "kg"
-    if re.search(r"\b(l|lt|litro|litri|ml)\b", u):
+    if tokens & _L_TOKENS:
         return "l"
-    if re.search(r"\b(pz|pezzo|pezzi|unit[aà])\b", u):
+    if tokens & _PZ_TOKENS:
         return "pz"
     return None
 
 
+# Server-side twin of _infer_unit_reference_from_unit for the offer backfill
+# (PostgreSQL ARE syntax: \y is a word boundary, ~* matches case-insensitively).
+_UNIT_REFERENCE_SQL_PATTERNS = (
+    ("kg", r"\y(kg|kilo|gramm|g)\y"),
+    ("l", r"\y(l|lt|litro|litri|ml)\y"),
+    ("pz", r"\y(pz|pezzo|pezzi|unit[aà])\y"),
+)
+
+
+def _group_key(name: str, brand: str | None) -> tuple[str, str]:
+    """Products sharing this key are classified with a single AI answer."""
+    return name.lower(), (brand or "").lower()
+
+
+def _product_update(item: dict, row) -> dict | None:
+    """Turn one AI answer into a bulk-UPDATE row (``{"id": ..., **values}``)
+    for *row*, only overwriting missing or generic fields."""
+    product_id, _, _, current_category, current_subcategory, current_unit = row
+    category = (item.get("category") or "").strip()
+    subcategory = (item.get("subcategory") or "").strip() or None
+    unit = (item.get("unit") or "").strip() or None
+
+    # Build update values (overwrite generic categories)
+    values = {}
+    if category and (current_category is None or current_category in _GENERIC_CATEGORIES):
+        values["category"] = category
+    if subcategory and (
+        current_subcategory is None or current_subcategory in _GENERIC_CATEGORIES
+    ):
+        values["subcategory"] = subcategory
+    if current_unit is None and unit:
+        values["unit"] = unit
+
+    return {"id": product_id, **values} if values else None
+
+
 # ---------------------------------------------------------------------------
 # Main enrichment logic
 # ---------------------------------------------------------------------------
@@ -175,6 +244,7 @@ async def enrich_products(
     model_name: str | None = None,
     target: str = "null",
     provider_name: str = "claude",
+    concurrency: int = 4,
 ) -> None:
     from app.config import get_settings
     from app.database import async_session
@@ -190,7 +260,7 @@ async def enrich_products(
             logger.error("ANTHROPIC_API_KEY not set. Aborting.")
             return
         model = model_name or "claude-haiku-4-5-20251001"
-        provider = ClaudeProvider(api_key, model)
+        provider = _get_provider(provider_name, api_key, model)
         logger.info("Using Claude model: %s", model)
     else:
         api_key = settings.gemini_api_key
@@ -198,7 +268,7 @@ async def enrich_products(
             logger.error("GEMINI_API_KEY not set. Aborting.")
             return
         model = model_name or settings.gemini_model
-        provider = GeminiProvider(api_key, model)
+        provider = _get_provider(provider_name, api_key, model)
         logger.info("Using Gemini model: %s", model)
 
     # ------------------------------------------------------------------
@@ -224,151 +294,195 @@ async def enrich_products(
         else:  # "null"
             query = base_query.where(Product.category.is_(None))
 
-        result = await session.execute(query)
-        products = result.all()
-        logger.info("Found %d products to enrich (target=%s).", len(products), target)
+        total = await session.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
+        distinct = await session.scalar(
+            select(func.count()).select_from(
+                query.with_only_columns(
+                    func.lower(Product.name),
+                    func.lower(func.coalesce(Product.brand, "")),
+                )
+                .distinct()
+                .subquery()
+            )
+        )
+        logger.info(
+            "Found %d products to enrich (%d distinct name/brand, target=%s).",
+            total, distinct, target,
+        )
 
-        if not products:
+        if not total:
             logger.info("Nothing to enrich.")
             return
 
-        # Process in batches
         enriched_count = 0
-        total_batches = (len(products) + batch_size - 1) // batch_size
-
-        for batch_idx in range(total_batches):
-            start = batch_idx * batch_size
-            batch = products[start : start + batch_size]
-
-            # Build input payload (use sequential int ids for matching)
-            payload = []
-            id_map = {}
-            for local_idx, row in enumerate(batch):
-                payload.append({
-                    "id": local_idx,
-                    "name": row.name,
-                    "brand": row.brand or "",
-                })
-                id_map[local_idx] = row
-
-            logger.info(
-                "Batch %d/%d: sending %d products to %s...",
-                batch_idx + 1, total_batches, len(payload), provider_name,
-            )
-
-            if dry_run:
-                for item in payload:
-                    logger.info(
-                        "  [dry-run] id=%d name='%s' brand='%s'",
-                        item["id"], item["name"][:60], item["brand"],
-                    )
-                continue
-
-            # Call AI provider
-            user_prompt = json.dumps(payload, ensure_ascii=False)
+        total_batches = (distinct + batch_size - 1) // batch_size
+
+        # Products sharing (name, brand) are classified once.  ``groups``
+        # holds the rows waiting on each key's answer (the first one is the
+        # one sent); rows streamed in after the answer use ``answers``.
+        groups: dict[tuple[str, str], list] = {}
+        answers: dict[tuple[str, str], dict] = {}
+
+        async def write(updates: list[dict]) -> None:
+            """Apply results with one bulk UPDATE (executemany by primary key)."""
+            nonlocal enriched_count
+            if updates:
+                await session.execute(update(Product), updates)
+                enriched_count += len(updates)
+
+        async def key_batches():
+            """Stream the products (server-side cursor, one partition at a
+            time) and yield up to ``batch_size`` new keys at a time."""
+            keys: list[tuple[str, str]] = []
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+            async for partition in result.tuples().partitions(batch_size):
+                late: list[dict] = []
+                for row in partition:
+                    key = _group_key(row[1], row[2])  # (id, name, brand, ...)
+                    if key in answers:
+                        late.append(_product_update(answers[key], row))
+                    elif key in groups:
+                        groups[key].append(row)
+                    else:
+                        groups[key] = [row]
+                        keys.append(key)
+                await write([u for u in late if u])
+                while len(keys) >= batch_size:
+                    yield keys[:batch_size]
+                    del keys[:batch_size]
+            if keys:
+                yield keys
+
+        # Up to ``concurrency`` AI calls in flight; DB writes stay on this
+        # coroutine, applied in arrival order.
+        pending: set[asyncio.Task] = set()
+
+        async def classify(batch_idx: int, keys: list, user_prompt: str):
             try:
-                raw_json = await provider.classify(user_prompt)
+                return batch_idx, keys, await provider.classify(user_prompt)
             except Exception:
                 logger.exception(
                     "AI call failed for batch %d. Skipping.",
                     batch_idx + 1,
                 )
-                if batch_idx < total_batches - 1:
-                    time.sleep(sleep_seconds)
-                continue
+                return batch_idx, keys, None
+
+        async def apply(task) -> None:
+            batch_idx, keys, raw_json = await task
+            if raw_json is None:
+                return
 
             items = _parse_json_response(raw_json)
             if not isinstance(items, list):
                 logger.error("AI returned non-list for batch %d. Skipping.", batch_idx + 1)
-                if batch_idx < total_batches - 1:
-                    time.sleep(sleep_seconds)
-                continue
+                return
 
-            # Apply results via UPDATE statements
+            # Fan each answer out to every product sharing its key
+            updates: list[dict] = []
             for item in items:
                 if not isinstance(item, dict):
                     continue
                 local_id = item.get("id")
-                if local_id is None or local_id not in id_map:
+                if not isinstance(local_id, int) or not 0 <= local_id < len(keys):
                     continue
-
-                row = id_map[local_id]
+                key = keys[local_id]
+                answers[key] = item
                 category = (item.get("category") or "").strip()
-                subcategory = (item.get("subcategory") or "").strip() or None
-                unit = (item.get("unit") or "").strip() or None
-
                 if category and category not in VALID_CATEGORIES:
                     logger.warning(
                         "Category '%s' not in valid list for product '%s'. Accepting anyway.",
-                        category, row.name[:50],
+                        category, key[0][:50],
                     )
-
-                # Build update values (overwrite generic categories)
-                values = {}
-                if category and (row.category is None or row.category in _GENERIC_CATEGORIES):
-                    values["category"] = category
-                if subcategory and (row.subcategory is None or row.subcategory in _GENERIC_CATEGORIES):
-                    values["subcategory"] = subcategory
-                if row.unit is None and unit:
-                    values["unit"] = unit
-
-                if values:
-                    await session.execute(
-                        update(Product)
-                        .where(Product.id == row.id)
-                        .values(**values)
-                    )
-                    enriched_count += 1
+                for row in groups.pop(key, ()):
+                    if (values := _product_update(item, row)) is not None:
+                        updates.append(values)
+            await write(updates)
 
             logger.info(
                 "Batch %d/%d: enriched %d products so far.",
                 batch_idx + 1, total_batches, enriched_count,
             )
 
+        batch_idx = -1
+        async for keys in key_batches():
+            batch_idx += 1
+
+            # Build input payload (the position in ``keys`` is the id used
+            # for matching; name/brand come from each key's first row)
+            payload = [
+                _PayloadItem(local_idx, row[1], row[2] or "")
+                for local_idx, row in enumerate(groups[key][0] for key in keys)
+            ]
+
+            logger.info(
+                "Batch %d/%d: sending %d products to %s...",
+                batch_idx + 1, total_batches, len(payload), provider_name,
+            )
+
+            if dry_run:
+                for item in payload:
+                    logger.info(
+                        "  [dry-run] id=%d name='%s' brand='%s'",
+                        item.id, item.name[:60], item.brand,
+                    )
+                continue
+
+            # Call AI provider in the background; results are applied as they
+            # arrive, so the next batch is fetched and sent meanwhile.
+            user_prompt = orjson.dumps(payload).decode()
+            pending.add(asyncio.create_task(classify(batch_idx, keys, user_prompt)))
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            else:
+                done = {task for task in pending if task.done()}
+                pending -= done
+            for task in done:
+                await apply(task)
+
             # Rate-limit sleep between batches
             if batch_idx < total_batches - 1:
-                time.sleep(sleep_seconds)
+                await asyncio.sleep(sleep_seconds)
 
-        if not dry_run:
-            await session.commit()
-            logger.info("Committed %d enriched products.", enriched_count)
+        for task in asyncio.as_completed(pending):
+            await apply(task)
 
-    # ------------------------------------------------------------------
-    # Phase 2: Backfill unit_reference on offers
-    # ------------------------------------------------------------------
-    if dry_run:
-        logger.info("[dry-run] Skipping offer backfill.")
-        return
+        if dry_run:
+            logger.info("[dry-run] Skipping offer backfill.")
+            return
 
-    async with async_session() as session:
+        # Commit phase 1 on its own so a failing backfill keeps the enrichment.
+        await session.commit()
+        logger.info("Committed %d enriched products.", enriched_count)
+
+        # --------------------------------------------------------------
+        # Phase 2: Backfill unit_reference on offers (same session and
+        # pooled connection as phase 1)
+        # --------------------------------------------------------------
+        # One UPDATE ... FROM products: the unit inference runs in the database.
+        unit_ref = case(
+            *(
+                (Product.unit.op("~*")(pattern), ref)
+                for ref, pattern in _UNIT_REFERENCE_SQL_PATTERNS
+            ),
+        )
         result = await session.execute(
-            select(
-                Offer.id,
-                Product.unit,
-            )
-            .join(Product, Offer.product_id == Product.id)
+            update(Offer)
             .where(
+                Offer.product_id == Product.id,
                 Offer.unit_reference.is_(None),
                 Product.unit.isnot(None),
                 Offer.price_per_unit.isnot(None),
+                unit_ref.isnot(None),
             )
+            .values(unit_reference=unit_ref)
+            .execution_options(synchronize_session=False)
         )
-        rows = result.all()
-        logger.info("Found %d offers to backfill unit_reference.", len(rows))
-
-        updated = 0
-        for offer_id, product_unit in rows:
-            unit_ref = _infer_unit_reference_from_unit(product_unit)
-            if unit_ref:
-                await session.execute(
-                    update(Offer)
-                    .where(Offer.id == offer_id)
-                    .values(unit_reference=unit_ref)
-                )
-                updated += 1
-
         await session.commit()
-        logger.info("Backfilled unit_reference on %d offers.", updated)
+        logger.info("Backfilled unit_reference on %d offers.", result.rowcount)
 
 
 def main():
@@ -411,6 +525,12 @@ def main():
         default="claude",
         help="AI provider to use (default: claude).",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum AI calls in flight at once (default: 4).",
+    )
     args = parser.parse_args()
 
     asyncio.run(
@@ -421,6 +541,7 @@ def main():
             sleep_seconds=args.sleep,
             target=args.target,
             provider_name=args.provider,
+            concurrency=args.concurrency,
         )
     )
 
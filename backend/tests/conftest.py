@@ -7,11 +7,16 @@ from datetime import date, timedelta
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
+from app.api.chains import clear_chain_cache
+from app.auth import clear_user_cache
 from app.database import Base, get_db
 from app.main import app
 from app.models import Chain, Flyer, Offer, Product, Store, UserProfile
+from app.models.offer import REFRESH_OFFERS_ACTIVE_SQL
 
 
 # Use PostgreSQL test database when DATABASE_URL is set (Docker),
@@ -23,26 +28,75 @@ if _db_url and "postgresql" in _db_url:
     # Point to the test database instead of the production one
     TEST_DATABASE_URL = _db_url.rsplit("/", 1)[0] + "/spesasmart_test"
 else:
-    TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+    # Named shared-cache in-memory database: no file I/O, and every pooled
+    # connection sees the same schema.
+    TEST_DATABASE_URL = (
+        "sqlite+aiosqlite:///file:spesasmart_test?mode=memory&cache=shared&uri=true"
+    )
+
+if TEST_DATABASE_URL.startswith("sqlite"):
+    # One shared connection: the in-memory database lives as long as it does.
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
 
-engine = create_async_engine(TEST_DATABASE_URL, echo=False)
-test_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    # pysqlite defers BEGIN and commits around SAVEPOINTs on its own; take
+    # over transaction control so the per-test rollback undoes everything.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_manual_transactions(dbapi_connection, _record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _sqlite_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+else:
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+# Bound per test to a connection inside an outer transaction (see
+# ``db_connection``); commits only release savepoints within it.
+test_session = async_sessionmaker(
+    class_=AsyncSession,
+    expire_on_commit=False,
+    join_transaction_mode="create_savepoint",
+)
 
 
 @pytest.fixture(scope="session")
 def event_loop():
     loop = asyncio.new_event_loop()
     yield loop
+    # Close pooled connections; aiosqlite's worker thread would otherwise
+    # keep the interpreter alive after the run.
+    loop.run_until_complete(engine.dispose())
     loop.close()
 
 
-@pytest_asyncio.fixture(autouse=True)
-async def setup_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+@pytest.fixture(scope="session", autouse=True)
+def setup_db(event_loop):
+    """Create the schema once for the whole run."""
+    async def recreate(create: bool) -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            if create:
+                await conn.run_sync(Base.metadata.create_all)
+
+    event_loop.run_until_complete(recreate(create=True))
     yield
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    event_loop.run_until_complete(recreate(create=False))
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def db_connection():
+    """Run each test inside one transaction that is rolled back afterwards."""
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        test_session.configure(bind=conn)
+        clear_chain_cache()
+        clear_user_cache()
+        yield conn
+        await trans.rollback()
 
 
 async def override_get_db():
@@ -73,64 +127,64 @@ async def db():
 
 @pytest_asyncio.fixture
 async def sample_chain(db: AsyncSession) -> Chain:
-    chain = Chain(
-        id=uuid.uuid4(),
-        name="Esselunga",
-        slug="esselunga",
-        website_url="https://esselunga.it",
+    chain = await db.scalar(
+        insert(Chain).values(
+            id=uuid.uuid4(),
+            name="Esselunga",
+            slug="esselunga",
+            website_url="https://esselunga.it",
+        ).returning(Chain)
     )
-    db.add(chain)
     await db.commit()
-    await db.refresh(chain)
     return chain
 
 
 @pytest_asyncio.fixture
 async def sample_store(db: AsyncSession, sample_chain: Chain) -> Store:
-    store = Store(
-        id=uuid.uuid4(),
-        chain_id=sample_chain.id,
-        name="Esselunga Monza",
-        address="Via Test 1",
-        city="Monza",
-        province="MB",
-        zip_code="20900",
+    store = await db.scalar(
+        insert(Store).values(
+            id=uuid.uuid4(),
+            chain_id=sample_chain.id,
+            name="Esselunga Monza",
+            address="Via Test 1",
+            city="Monza",
+            province="MB",
+            zip_code="20900",
+        ).returning(Store)
     )
-    db.add(store)
     await db.commit()
-    await db.refresh(store)
     return store
 
 
 @pytest_asyncio.fixture
 async def sample_product(db: AsyncSession) -> Product:
-    product = Product(
-        id=uuid.uuid4(),
-        name="Latte Granarolo PS 1L",
-        brand="Granarolo",
-        category="Latticini",
-        unit="l",
+    product = await db.scalar(
+        insert(Product).values(
+            id=uuid.uuid4(),
+            name="Latte Granarolo PS 1L",
+            brand="Granarolo",
+            category="Latticini",
+            unit="l",
+        ).returning(Product)
     )
-    db.add(product)
     await db.commit()
-    await db.refresh(product)
     return product
 
 
 @pytest_asyncio.fixture
 async def sample_flyer(db: AsyncSession, sample_chain: Chain) -> Flyer:
     today = date.today()
-    flyer = Flyer(
-        id=uuid.uuid4(),
-        chain_id=sample_chain.id,
-        title="Offerte della settimana",
-        valid_from=today - timedelta(days=1),
-        valid_to=today + timedelta(days=6),
-        status="completed",
+    flyer = await db.scalar(
+        insert(Flyer).values(
+            id=uuid.uuid4(),
+            chain_id=sample_chain.id,
+            title="Offerte della settimana",
+            valid_from=today - timedelta(days=1),
+            valid_to=today + timedelta(days=6),
+            status="completed",
+        ).returning(Flyer)
     )
-    db.add(flyer)
     await db.commit()
-    await db.refresh(flyer)
     return flyer
 
 
@@ -142,32 +196,36 @@ async def sample_offer(
     sample_chain: Chain,
 ) -> Offer:
     today = date.today()
-    offer = Offer(
-        id=uuid.uuid4(),
-        product_id=sample_product.id,
-        flyer_id=sample_flyer.id,
-        chain_id=sample_chain.id,
-        original_price=1.89,
-        offer_price=1.29,
-        discount_pct=31.75,
-        discount_type="percentage",
-        valid_from=today - timedelta(days=1),
-        valid_to=today + timedelta(days=6),
+    offer = await db.scalar(
+        insert(Offer).values(
+            id=uuid.uuid4(),
+            product_id=sample_product.id,
+            flyer_id=sample_flyer.id,
+            chain_id=sample_chain.id,
+            original_price=1.89,
+            offer_price=1.29,
+            discount_pct=31.75,
+            discount_type="percentage",
+            valid_from=today - timedelta(days=1),
+            valid_to=today + timedelta(days=6),
+        ).returning(Offer)
     )
-    db.add(offer)
     await db.commit()
-    await db.refresh(offer)
+    if engine.dialect.name == "postgresql":
+        # Offer listings read the offers_active view; refresh it as ingestion does.
+        await db.execute(text(REFRESH_OFFERS_ACTIVE_SQL))
+        await db.commit()
     return offer
 
 
 @pytest_asyncio.fixture
 async def sample_user(db: AsyncSession) -> UserProfile:
-    user = UserProfile(
-        id=uuid.uuid4(),
-        telegram_chat_id=123456789,
-        preferred_zone="Monza e Brianza",
+    user = await db.scalar(
+        insert(UserProfile).values(
+            id=uuid.uuid4(),
+            telegram_chat_id=123456789,
+            preferred_zone="Monza e Brianza",
+        ).returning(UserProfile)
     )
-    db.add(user)
     await db.commit()
-    await db.refresh(user)
     return user
@@ -1,9 +1,19 @@
 """Tests for API endpoints."""
 
+import uuid
+from datetime import date, timedelta
+
+import orjson
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api import offers as offers_api
+from app.api.offers import ActiveOffer, _offer_rows_query
+from app.auth import create_access_token
 from app.models import Chain, Flyer, Offer, Product, Store, UserProfile
+from tests.conftest import test_session
 
 
 @pytest.mark.asyncio
@@ -32,6 +42,17 @@ async def test_list_chains(client: AsyncClient, sample_chain: Chain):
     assert data[0]["name"] == "Esselunga"
 
 
+@pytest.mark.asyncio
+async def test_list_chains_etag(client: AsyncClient, sample_chain: Chain):
+    resp = await client.get("/api/v1/chains")
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+
+    resp = await client.get("/api/v1/chains", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+
+
 @pytest.mark.asyncio
 async def test_get_chain(client: AsyncClient, sample_chain: Chain):
     resp = await client.get(f"/api/v1/chains/{sample_chain.id}")
@@ -131,6 +152,111 @@ async def test_best_offers(client: AsyncClient, sample_offer: Offer):
     assert resp.status_code == 200
 
 
+async def _add_expired_offer(db: AsyncSession, offer: Offer, price: float) -> None:
+    today = date.today()
+    await db.execute(
+        insert(Offer).values(
+            id=uuid.uuid4(),
+            product_id=offer.product_id,
+            chain_id=offer.chain_id,
+            offer_price=price,
+            valid_from=today - timedelta(days=14),
+            valid_to=today - timedelta(days=8),
+        )
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_active_offers_previous_price(
+    client: AsyncClient, db: AsyncSession, sample_offer: Offer
+):
+    await _add_expired_offer(db, sample_offer, 1.49)
+
+    resp = await client.get("/api/v1/offers/active")
+    assert resp.status_code == 200
+    (offer,) = resp.json()
+    assert offer["offer_price"] == 1.29
+    assert offer["previous_price"] == 1.49
+
+
+@pytest.mark.asyncio
+async def test_offer_rows_without_lateral(db: AsyncSession, sample_offer: Offer):
+    """The correlated-subquery fallback returns the same previous offer."""
+    await _add_expired_offer(db, sample_offer, 1.59)
+    await _add_expired_offer(db, sample_offer, 1.49)
+
+    result = await db.execute(
+        _offer_rows_query(Offer, lateral=False).where(Offer.id == sample_offer.id)
+    )
+    row = result.mappings().one()
+    assert row["offer_price"] == 1.29
+    assert row["previous_price"] in (1.49, 1.59)
+    assert row["previous_date"] == date.today() - timedelta(days=14)
+
+
+@pytest.mark.asyncio
+async def test_active_offers_stream(
+    client: AsyncClient, sample_offer: Offer, monkeypatch: pytest.MonkeyPatch
+):
+    # The stream opens its own session; point it at the test connection.
+    monkeypatch.setattr(offers_api, "async_session", test_session)
+
+    resp = await client.get("/api/v1/offers/active/stream")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = resp.content.splitlines()
+    assert len(lines) == 1
+    offer = orjson.loads(lines[0])
+    assert offer["id"] == str(sample_offer.id)
+    assert offer["offer_price"] == 1.29
+
+
+# --- Auth ---
+
+@pytest.mark.asyncio
+async def test_register_email_case_insensitive(client: AsyncClient):
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={"email": "Mario.Rossi@Example.com", "password": "secret1"},
+    )
+    assert resp.status_code == 201
+    assert resp.json()["user"]["email"] == "mario.rossi@example.com"
+
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={"email": "mario.rossi@example.com", "password": "secret2"},
+    )
+    assert resp.status_code == 409
+
+    resp = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "MARIO.rossi@example.COM", "password": "secret1"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["user"]["email"] == "mario.rossi@example.com"
+
+
+@pytest.mark.asyncio
+async def test_me_sees_user_update(
+    client: AsyncClient, db: AsyncSession, sample_user: UserProfile
+):
+    """Updating a user drops its cached snapshot."""
+    token = create_access_token(str(sample_user.id), "")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await client.get("/api/v1/auth/me", headers=headers)
+    assert resp.json()["preferred_zone"] == "Monza e Brianza"
+
+    user = await db.get(UserProfile, sample_user.id)
+    user.preferred_zone = "Milano"
+    await db.commit()
+
+    resp = await client.get("/api/v1/auth/me", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["preferred_zone"] == "Milano"
+
+
 # --- Users ---
 
 @pytest.mark.asyncio
@@ -0,0 +1,66 @@
+"""Tests for bulk offer ingest."""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Chain, Flyer, Offer, Product
+from app.scrapers.bulk import copy_offers
+
+
+def _offer_rows(product: Product, flyer: Flyer, chain: Chain) -> list[dict]:
+    return [
+        {
+            "product_id": product.id,
+            "flyer_id": flyer.id,
+            "chain_id": chain.id,
+            "offer_price": Decimal(price),
+            "discount_pct": Decimal("20"),
+            "valid_from": flyer.valid_from,
+            "valid_to": flyer.valid_to,
+            "raw_text": "Latte",
+        }
+        for price in ("1.19", "1.29")
+    ]
+
+
+async def _stored_prices(db: AsyncSession, flyer: Flyer) -> list[Decimal]:
+    result = await db.execute(
+        select(Offer.offer_price)
+        .where(Offer.flyer_id == flyer.id)
+        .order_by(Offer.offer_price)
+    )
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_copy_offers(
+    db: AsyncSession, sample_product: Product, sample_flyer: Flyer, sample_chain: Chain
+):
+    rows = _offer_rows(sample_product, sample_flyer, sample_chain)
+    assert await copy_offers(db, rows) == 2
+    assert await _stored_prices(db, sample_flyer) == [Decimal("1.19"), Decimal("1.29")]
+
+
+@pytest.mark.asyncio
+async def test_copy_offers_executemany_fallback(
+    db: AsyncSession,
+    sample_product: Product,
+    sample_flyer: Flyer,
+    sample_chain: Chain,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Drivers without COPY get one executemany INSERT."""
+    conn = await db.connection()
+    monkeypatch.setattr(conn.dialect, "driver", "no-copy")
+
+    rows = _offer_rows(sample_product, sample_flyer, sample_chain)
+    assert await copy_offers(db, rows) == 2
+    assert await _stored_prices(db, sample_flyer) == [Decimal("1.19"), Decimal("1.29")]
+
+
+@pytest.mark.asyncio
+async def test_copy_offers_empty(db: AsyncSession):
+    assert await copy_offers(db, []) == 0